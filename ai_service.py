@@ -0,0 +1,379 @@
+"""
+Layanan Gemini AI: rekomendasi film serupa dan deskripsi singkat film.
+
+Hasil panggilan Gemini disimpan di cache persisten (SQLite) yang dipakai
+bersama semua sesi user dan worker process. Key cache terdiri dari jenis
+hasil, nama model, versi prompt dan judul yang sudah dinormalisasi, jadi
+mengganti model atau prompt otomatis membuat entri baru. Prompt tunggal,
+gabungan dan batch disusun dari instruksi yang sama, dan versi prompt adalah
+hash instruksi tersebut: hasil dari jalur mana pun disimpan di bawah versi
+instruksi yang menghasilkannya.
+
+Objek GenerativeModel dibuat sekali per jenis output dan dipakai ulang;
+`genai.configure` hanya dipanggil ulang jika API key berubah. SDK Gemini
+sendiri baru di-import saat model pertama kali dibutuhkan, jadi halaman yang
+tidak memanggil AI tidak ikut menanggung waktu import-nya.
+"""
+import hashlib
+import json
+import threading
+
+import typing_extensions as typing
+
+import background
+import config
+import disk_cache
+import metrics
+import upstream
+from utils import normalize_title
+
+MODEL_NAME = "gemini-2.5-flash"
+
+# Modul google.generativeai (di-import pertama kali oleh _sdk())
+genai = None
+
+_api_key = None
+_configured_key = None
+_models = {}
+_models_lock = threading.Lock()
+
+# Judul (ternormalisasi) -> Future batch sinopsis yang sedang berjalan
+_batch_inflight = {}
+_batch_lock = threading.Lock()
+
+
+def set_api_key(api_key):
+    """Dipanggil dari main.py setiap run dengan API key dari st.secrets."""
+    global _api_key
+    _api_key = api_key
+
+
+def _has_api_key() -> bool:
+    return bool(_api_key) and _api_key != "GANTI_DENGAN_API_KEY_DISINI"
+
+
+def _result_cache():
+    return disk_cache.get_cache(
+        "gemini",
+        default_ttl=config.GEMINI_CACHE_TTL,
+        max_bytes=config.GEMINI_CACHE_MAX_BYTES,
+    )
+
+
+def _cache_key(kind: str, prompt_version: str, movie_title: str) -> str:
+    return f"{kind}:{MODEL_NAME}:{prompt_version}:{normalize_title(movie_title)}"
+
+
+# 1. Definisikan Struktur Data (Schema) untuk Output Gemini
+class MovieRecommendation(typing.TypedDict):
+    judul_film: str
+    imdb_rating: float
+    image_url: str
+
+# Schema gabungan: sinopsis + rekomendasi dalam satu respons
+class MovieSynopsisAndRecommendations(typing.TypedDict):
+    sinopsis: str
+    rekomendasi: list[MovieRecommendation]
+
+# Schema batch: satu sinopsis per judul
+class MovieSynopsis(typing.TypedDict):
+    judul: str
+    sinopsis: str
+
+
+def _sdk():
+    """Modul SDK Gemini; import pertama (~0,5 detik) dicatat sebagai span."""
+    global genai
+    if genai is None:
+        with metrics.span("module_import", module="google.generativeai"):
+            import google.generativeai as sdk
+        genai = sdk
+    return genai
+
+
+def _get_model(response_schema=None):
+    """Mengembalikan GenerativeModel bersama untuk schema tertentu (None = teks biasa)."""
+    global _configured_key
+    with _models_lock:
+        genai = _sdk()
+        if _configured_key != _api_key:
+            genai.configure(api_key=_api_key)
+            _configured_key = _api_key
+            _models.clear()
+
+        model = _models.get(response_schema)
+        if model is None:
+            if response_schema is None:
+                model = genai.GenerativeModel(MODEL_NAME)
+            else:
+                # Menggunakan Schema agar output PASTI JSON yang valid
+                model = genai.GenerativeModel(
+                    MODEL_NAME,
+                    generation_config={
+                        "response_mime_type": "application/json",
+                        "response_schema": response_schema
+                    }
+                )
+            _models[response_schema] = model
+        return model
+
+
+def _recommendation_task(movie_title: str) -> str:
+    """Instruksi rekomendasi (dipakai prompt tunggal dan gabungan)."""
+    return f"""6 rekomendasi film yang sangat mirip atau relevan dengan film '{movie_title}' berdasarkan data IMDb.
+        Untuk setiap film, berikan:
+        - judul_film: Judul lengkap film.
+        - imdb_rating: Rating IMDb (float).
+        - image_url: URL poster film yang valid (cari poster paling ikonik/umum)."""
+
+
+def _description_task(subject: str) -> str:
+    """Instruksi sinopsis (dipakai prompt tunggal, gabungan dan batch)."""
+    return (
+        f"deskripsi plot atau sebuah sipnosis yang singkat dan menarik (maksimal 1 paragraf) untuk {subject}. "
+        "Fokus pada premis utama tanpa membocorkan akhir cerita (spoiler)."
+    )
+
+
+def _prompt_version(prefix: str, instruction: str) -> str:
+    # Hash instruksi: mengubah isi helper di atas otomatis membuat versi (dan entri cache) baru
+    return f"{prefix}-{hashlib.sha1(instruction.encode('utf-8')).hexdigest()[:10]}"
+
+
+RECOMMENDATION_PROMPT_VERSION = _prompt_version("rec", _recommendation_task("{judul}"))
+DESCRIPTION_PROMPT_VERSION = _prompt_version("desc", _description_task("{judul}"))
+
+
+def _recommendation_prompt(movie_title: str) -> str:
+    return f"""
+        Bertindaklah sebagai ahli film dan rekomendasi movie.
+        Tugas: Berikan {_recommendation_task(movie_title)}
+        """
+
+
+def _description_prompt(movie_title: str) -> str:
+    return f"""
+        Tugas: Berikan {_description_task(f"film '{movie_title}'")}
+        """
+
+
+def _combined_prompt(movie_title: str) -> str:
+    return f"""
+        Bertindaklah sebagai ahli film dan rekomendasi movie.
+        Untuk film '{movie_title}', berikan:
+        1. sinopsis: {_description_task("film ini")}
+        2. rekomendasi: {_recommendation_task(movie_title)}
+        """
+
+
+def _batch_description_prompt(titles) -> str:
+    title_lines = "\n".join(f"- {title}" for title in titles)
+    return f"""
+        Tugas: Untuk setiap film di daftar berikut, berikan {_description_task("film tersebut")}
+        Kembalikan satu objek per film dengan judul persis seperti di daftar (judul) dan sinopsisnya (sinopsis).
+
+        Daftar film:
+{title_lines}
+        """
+
+
+def _store_recommendations(movie_title: str, recommendations):
+    # Hanya hasil yang valid yang di-cache, error akan dicoba lagi
+    if isinstance(recommendations, list) and recommendations:
+        _result_cache().set(_cache_key("recommendations", RECOMMENDATION_PROMPT_VERSION, movie_title), recommendations)
+
+
+def _store_description(movie_title: str, description):
+    if description:
+        _result_cache().set(_cache_key("description", DESCRIPTION_PROMPT_VERSION, movie_title), description)
+
+
+def get_cached_recommendations(movie_title: str):
+    cached = _result_cache().get(_cache_key("recommendations", RECOMMENDATION_PROMPT_VERSION, movie_title))
+    metrics.record_cache("gemini_recommendations", cached is not None)
+    return cached
+
+
+def get_cached_description(movie_title: str):
+    cached = _result_cache().get(_cache_key("description", DESCRIPTION_PROMPT_VERSION, movie_title))
+    metrics.record_cache("gemini_description", cached is not None)
+    return cached
+
+
+def _generate(model, prompt: str, kind: str):
+    """
+    Satu panggilan Gemini, diukur sebagai span `gemini_generate` per jenis.
+    Prompt identik yang sedang berjalan (mis. film trending dibuka banyak sesi) dipakai bersama;
+    setiap panggilan punya batas waktu dan lewat circuit breaker/retry (lihat upstream.py).
+    """
+    timeout = config.GEMINI_BATCH_TIMEOUT if kind == "description_batch" else config.GEMINI_TIMEOUT
+
+    def send():
+        with metrics.span("gemini_generate", kind=kind):
+            return model.generate_content(prompt, request_options={"timeout": timeout})
+
+    return upstream.call("gemini", (kind, prompt), send)
+
+
+# 2. Fungsi Helper Gemini untuk Rekomendasi
+@metrics.timed("get_movie_recommendations")
+def get_movie_recommendations(movie_title: str):
+    """
+    Meminta rekomendasi film serupa dari Gemini API dalam format JSON.
+    """
+    if not _has_api_key():
+        return {"error": "API Key Gemini belum diatur atau masih default."}
+
+    cached = get_cached_recommendations(movie_title)
+    if cached is not None:
+        return cached
+
+    try:
+        model = _get_model(list[MovieRecommendation])
+        response = _generate(model, _recommendation_prompt(movie_title), "recommendations")
+        recommendations = json.loads(response.text)
+
+    except Exception as e:
+        return {"error": f"Gagal menghubungi Gemini: {str(e)}"}
+
+    _store_recommendations(movie_title, recommendations)
+    return recommendations
+
+# 3. Fungsi Helper Gemini untuk Deskripsi
+@metrics.timed("get_movie_description")
+def get_movie_description(movie_title: str):
+    """
+    Meminta Gemini untuk membuat deskripsi singkat tentang film jika data API kosong.
+    """
+    if not _has_api_key():
+        return None
+
+    cached = get_cached_description(movie_title)
+    if cached is not None:
+        return cached
+
+    # Judul ini sedang diproses batch: jangan memanggil ulang dan jangan menunggu,
+    # hasilnya masuk ke cache deskripsi (lihat description_batch)
+    if description_batch(movie_title) is not None:
+        return None
+
+    try:
+        # Gunakan model tanpa schema JSON karena kita hanya butuh teks
+        model = _get_model()
+        response = _generate(model, _description_prompt(movie_title), "description")
+        description = response.text
+
+    except Exception:
+        return None
+
+    _store_description(movie_title, description)
+    return description
+
+# 4. Mode gabungan: deskripsi + rekomendasi dalam satu panggilan
+@metrics.timed("get_movie_description_and_recommendations")
+def get_movie_description_and_recommendations(movie_title: str):
+    """
+    Mengembalikan (deskripsi, rekomendasi) untuk film tanpa overview.
+    Jika keduanya belum ada di cache, cukup satu panggilan Gemini dengan schema gabungan;
+    hasilnya disimpan ke cache deskripsi dan rekomendasi masing-masing.
+    """
+    if not _has_api_key():
+        return None, {"error": "API Key Gemini belum diatur atau masih default."}
+
+    description = get_cached_description(movie_title)
+    recommendations = get_cached_recommendations(movie_title)
+    if description is None and description_batch(movie_title) is not None:
+        # Deskripsi sedang dikerjakan batch (diambil dari cache setelah selesai), cukup minta rekomendasi
+        return None, recommendations if recommendations is not None else get_movie_recommendations(movie_title)
+    if description is not None and recommendations is not None:
+        return description, recommendations
+    if description is not None:
+        return description, get_movie_recommendations(movie_title)
+    if recommendations is not None:
+        return get_movie_description(movie_title), recommendations
+
+    try:
+        model = _get_model(MovieSynopsisAndRecommendations)
+        response = _generate(model, _combined_prompt(movie_title), "description_and_recommendations")
+        result = json.loads(response.text)
+        description = result.get("sinopsis") or None
+        recommendations = result.get("rekomendasi") or []
+
+    except Exception as e:
+        return None, {"error": f"Gagal menghubungi Gemini: {str(e)}"}
+
+    _store_description(movie_title, description)
+    _store_recommendations(movie_title, recommendations)
+    return description, recommendations
+
+# 5. Batch sinopsis untuk hasil pencarian yang tidak punya overview
+def description_batch(movie_title: str):
+    """
+    Future batch sinopsis yang sedang memproses judul ini, atau None.
+    Setelah selesai, hasilnya ada di get_cached_description (tidak ada jika batch gagal).
+    """
+    with _batch_lock:
+        future = _batch_inflight.get(normalize_title(movie_title))
+    if future is None or future.done():
+        return None
+    return future
+
+
+def _generate_description_chunk(titles):
+    """Satu panggilan Gemini untuk sekumpulan judul; hasil ditulis ke cache deskripsi."""
+    try:
+        model = _get_model(list[MovieSynopsis])
+        response = _generate(model, _batch_description_prompt(titles), "description_batch")
+        results = json.loads(response.text)
+    except Exception:
+        return
+
+    if not isinstance(results, list):
+        return
+    by_title = {normalize_title(item.get("judul")): item.get("sinopsis") for item in results if isinstance(item, dict)}
+    for idx, title in enumerate(titles):
+        description = by_title.get(normalize_title(title))
+        # Fallback ke urutan jika Gemini sedikit mengubah penulisan judul
+        if not description and len(results) == len(titles) and isinstance(results[idx], dict):
+            description = results[idx].get("sinopsis")
+        _store_description(title, description)
+
+
+def _finish_chunk(titles):
+    try:
+        _generate_description_chunk(titles)
+    finally:
+        with _batch_lock:
+            for title in titles:
+                _batch_inflight.pop(normalize_title(title), None)
+
+
+def start_description_batch(movies):
+    """
+    Menjadwalkan pembuatan sinopsis di background untuk semua film tanpa overview
+    dalam hasil pencarian. Judul yang sudah di-cache atau sedang diproses dilewati,
+    sisanya dipecah per GEMINI_BATCH_SIZE judul per panggilan.
+    """
+    if not _has_api_key() or not isinstance(movies, list):
+        return
+
+    titles = []
+    seen = set()
+    for movie in movies:
+        title = movie.get("title")
+        key = normalize_title(title)
+        if not key or movie.get("overview") or key in seen:
+            continue
+        seen.add(key)
+        titles.append(title)
+    titles = [title for title in titles if get_cached_description(title) is None]
+
+    executor = background.get_executor("ai-batch", config.GEMINI_BATCH_WORKERS)
+    with _batch_lock:
+        titles = [title for title in titles if normalize_title(title) not in _batch_inflight]
+        for start in range(0, len(titles), config.GEMINI_BATCH_SIZE):
+            chunk = titles[start:start + config.GEMINI_BATCH_SIZE]
+            # Lock masih dipegang, jadi _finish_chunk baru bisa menghapus setelah judul terdaftar
+            future = executor.submit(_finish_chunk, chunk)
+            for title in chunk:
+                _batch_inflight[normalize_title(title)] = future
@@ -0,0 +1,121 @@
+"""
+Klien HTTP bersama untuk semua panggilan ke API JustWatch/IMDb.
+
+Modul ini hanya di-import sekali per proses (berbeda dengan main.py yang
+dieksekusi ulang setiap rerun), sehingga Session beserta pool koneksinya
+dipakai ulang lintas rerun dan lintas sesi user. Handshake TCP+TLS cukup
+terjadi sekali per koneksi, bukan sekali per request.
+"""
+import ipaddress
+import socket
+import threading
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+import metrics
+import upstream
+from utils import normalize_title
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Mengembalikan Session bersama (dibuat sekali, thread-safe)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=config.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=config.HTTP_POOL_MAXSIZE,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Accept": "application/json",
+                    "Accept-Encoding": "gzip, deflate",
+                    "Connection": "keep-alive",
+                })
+                _session = session
+    return _session
+
+
+def get_json(path: str, params=None, timeout=None):
+    """GET ke API lalu kembalikan body JSON-nya (status HTTP error dijadikan exception)."""
+    read_timeout = timeout if timeout is not None else config.HTTP_READ_TIMEOUT
+    resp = get_session().get(
+        f"{config.API_BASE_URL}{path}",
+        params=params,
+        timeout=(config.HTTP_CONNECT_TIMEOUT, read_timeout),
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+@metrics.timed("justwatch_search")
+def justwatch_search(query: str, timeout=None):
+    """
+    Memanggil endpoint /justwatch?q= dan mengembalikan respons mentahnya.
+    Pencarian judul yang sama dari beberapa sesi sekaligus hanya dikirim sekali (lihat upstream.py).
+    """
+    return upstream.call(
+        "justwatch", normalize_title(query), get_json, "/justwatch", params={"q": query}, timeout=timeout
+    )
+
+
+def _check_public_url(url: str, allow_private: bool = False):
+    """
+    ValueError jika `url` bukan http(s), atau (kecuali `allow_private`) salah satu
+    alamat IP host-nya bukan alamat publik: loopback, jaringan privat, link-local
+    (mis. metadata cloud 169.254.169.254), reserved, multicast, dsb.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"URL tidak didukung: {url}")
+    if allow_private:
+        return
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        addresses = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise ValueError(f"Host {parts.hostname} tidak ditemukan: {e}") from e
+    for *_, sockaddr in addresses:
+        ip = ipaddress.ip_address(sockaddr[0])
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"Host {parts.hostname} mengarah ke alamat internal ({ip})")
+
+
+def get_bytes(url: str, max_bytes: int, timeout=None, allow_private: bool = False, max_redirects: int = 3) -> bytes:
+    """
+    GET URL absolut dari data luar (mis. gambar poster) lewat pool bersama.
+    Gagal jika host-nya alamat internal (lihat _check_public_url), status bukan 2xx
+    atau lebih dari `max_bytes`. Redirect diikuti manual agar setiap tujuannya ikut diperiksa.
+    """
+    read_timeout = timeout if timeout is not None else config.HTTP_READ_TIMEOUT
+    for _ in range(max_redirects + 1):
+        _check_public_url(url, allow_private)
+        with get_session().get(
+            url,
+            headers={"Accept": "image/*"},
+            timeout=(config.HTTP_CONNECT_TIMEOUT, read_timeout),
+            stream=True,
+            allow_redirects=False,
+        ) as resp:
+            if resp.is_redirect:
+                url = urljoin(url, resp.headers["location"])
+                continue
+            resp.raise_for_status()
+            chunks = []
+            size = 0
+            for chunk in resp.iter_content(64 * 1024):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f"Ukuran file melebihi {max_bytes} byte")
+                chunks.append(chunk)
+            return b"".join(chunks)
+    raise ValueError(f"Terlalu banyak redirect (maks. {max_redirects})")
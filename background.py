@@ -0,0 +1,23 @@
+"""
+Thread pool bersama untuk pekerjaan I/O (request API, Gemini) di luar
+thread script Streamlit. Pool dibuat sekali per proses per nama, sehingga
+pekerjaan latar belakang tidak mengantre di belakang request halaman.
+
+Catatan: fungsi yang dijalankan di sini TIDAK boleh memanggil `st.*`;
+hasilnya dirender oleh thread script setelah future selesai.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """Mengembalikan ThreadPoolExecutor bersama untuk `name`."""
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"film-{name}")
+            _executors[name] = executor
+        return executor
@@ -0,0 +1,9 @@
+"""
+Benchmark performa aplikasi yang berjalan sepenuhnya offline.
+
+Endpoint /justwatch?q= diganti server HTTP lokal (`fakes.FakeJustWatchServer`)
+dan `google.generativeai` diganti model tiruan (`fake_genai`), sehingga hasil
+bisa dibandingkan antar rilis tanpa jaringan maupun kuota API. Jalankan:
+
+    python -m benchmarks.run --output benchmarks/results/hasil.json
+"""
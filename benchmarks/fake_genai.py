@@ -0,0 +1,51 @@
+"""
+Pengganti modul `google.generativeai` untuk benchmark.
+
+Mengembalikan respons JSON sesuai schema yang diminta `ai_service` tanpa
+panggilan jaringan. `LATENCY` (detik) bisa diatur untuk mensimulasikan
+waktu respons Gemini; `CALLS` mencatat prompt yang masuk.
+"""
+import json
+import re
+import time
+
+LATENCY = 0.0
+CALLS = []
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+def _recommendations():
+    return [
+        {"judul_film": f"Rekomendasi {i}", "imdb_rating": 7.0 + i / 10, "image_url": ""}
+        for i in range(6)
+    ]
+
+
+def configure(api_key=None, **kwargs):
+    pass
+
+
+class GenerativeModel:
+    def __init__(self, model_name, generation_config=None, **kwargs):
+        self.model_name = model_name
+        self.generation_config = generation_config or {}
+
+    def generate_content(self, prompt, **kwargs):
+        CALLS.append(prompt)
+        if LATENCY:
+            time.sleep(LATENCY)
+
+        if self.generation_config.get("response_mime_type") != "application/json":
+            return _Response("Sinopsis tiruan untuk benchmark.")
+
+        schema = repr(self.generation_config.get("response_schema"))
+        if "MovieSynopsisAndRecommendations" in schema:
+            return _Response(json.dumps({"sinopsis": "Sinopsis tiruan.", "rekomendasi": _recommendations()}))
+        if "MovieSynopsis" in schema:
+            titles = [title.strip() for title in re.findall(r"^\s*- (.+)$", prompt, re.M)]
+            return _Response(json.dumps([{"judul": title, "sinopsis": f"Sinopsis {title}."} for title in titles]))
+        return _Response(json.dumps(_recommendations()))
@@ -0,0 +1,101 @@
+"""
+Server HTTP lokal pengganti API JustWatch untuk benchmark.
+
+Melayani GET /justwatch?q=<judul>[&n=<jumlah>] dengan respons berformat sama
+seperti API asli (key `description` berisi list film beserta `offers`) dan
+GET /poster/<n>.jpg dengan gambar JPEG berukuran poster asli.
+"""
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+
+DEFAULT_RESULTS = 30
+
+
+def make_movies(query: str, count: int, poster_base: str = ""):
+    """Data film mentah (format API) yang deterministik untuk `query`."""
+    movies = []
+    for i in range(count):
+        movies.append({
+            "title": f"{query} {i}",
+            "year": 1980 + i % 45,
+            "runtime": 85 + i % 70,
+            "jwRating": round(0.4 + (i % 60) / 100, 2),
+            "tomatometer": 50 + i % 50,
+            "poster": f"{poster_base}/poster/{i % 50}.jpg" if poster_base else "",
+            # Sebagian film tanpa overview agar jalur sinopsis AI ikut teruji
+            "overview": "" if i % 3 == 0 else f"{query} {i}: seorang pahlawan menghadapi petualangan di kota besar.",
+            "url": f"https://www.justwatch.com/id/film/{query.lower().replace(' ', '-')}-{i}",
+            "offers": [
+                {"name": "Netflix", "type": "FLATRATE", "url": f"https://www.netflix.com/title/{i}"},
+                {"name": "Apple TV", "type": "RENT", "url": f"https://tv.apple.com/movie/{i}"},
+            ],
+        })
+    return movies
+
+
+def _poster_bytes():
+    out = io.BytesIO()
+    Image.new("RGB", (1000, 1500), (90, 60, 140)).save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    poster = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith("/poster/"):
+            self._send(200, "image/jpeg", self.poster)
+            return
+        if url.path != "/justwatch":
+            self._send(404, "text/plain", b"not found")
+            return
+
+        params = parse_qs(url.query)
+        query = params.get("q", [""])[0]
+        count = int(params.get("n", [DEFAULT_RESULTS])[0])
+        self.server.search_calls.append(query)
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        body = json.dumps({"ok": True, "description": make_movies(query, count, base)}).encode("utf-8")
+        self._send(200, "application/json", body)
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeJustWatchServer:
+    """Server lokal di port acak; `url` dipakai sebagai FILM_API_BASE_URL."""
+
+    def __init__(self):
+        _Handler.poster = _poster_bytes()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.search_calls = []
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def search_calls(self):
+        return self._server.search_calls
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
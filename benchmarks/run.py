@@ -0,0 +1,437 @@
+"""
+Menjalankan semua benchmark lalu menyimpan hasilnya sebagai JSON.
+
+    python -m benchmarks.run [--output FILE] [--sizes 1000,100000] [--repeat 5]
+                             [--baseline FILE_LAMA] [--threshold 1.2]
+
+Setiap benchmark dicatat dengan waktu min/median/mean/max (milidetik).
+Dengan --baseline, median dibandingkan dengan hasil lama dan benchmark yang
+melambat lebih dari --threshold kali ditandai sebagai regresi (exit code 1
+jika --fail-on-regression diberikan).
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_MAIN_SCRIPT = os.path.join(_ROOT, "main.py")
+
+# Benchmark berat (mis. halaman penuh) diulang lebih sedikit
+_PAGE_REPEAT = 3
+
+
+class _UploadedFile(io.BytesIO):
+    """Meniru UploadedFile Streamlit (name, size, type) untuk importer."""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        self.type = ""
+        self.file_id = name
+
+
+def _timings(samples):
+    ms = [sample * 1000 for sample in samples]
+    return {
+        "repeat": len(ms),
+        "min_ms": round(min(ms), 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "max_ms": round(max(ms), 3),
+    }
+
+
+class Runner:
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results = {}
+
+    def measure(self, name, fn, repeat=None, setup=None, **extra):
+        """Menjalankan `fn(setup())` sebanyak `repeat` kali; waktu setup tidak dihitung."""
+        samples = []
+        for _ in range(repeat or self.repeat):
+            arg = setup() if setup else None
+            start = time.perf_counter()
+            fn(arg) if setup else fn()
+            samples.append(time.perf_counter() - start)
+        return self.record(name, samples, **extra)
+
+    def record(self, name, samples, **extra):
+        """Mencatat waktu (detik) yang diukur sendiri oleh benchmark."""
+        result = _timings(samples)
+        result.update(extra)
+        self.results[name] = result
+        print(f"{name:<45} median {result['median_ms']:>10.2f} ms  (min {result['min_ms']:.2f})", flush=True)
+        return result
+
+
+# =================DATA UJI=================
+
+def _search_results(size: int):
+    import movie_search
+    from benchmarks.fakes import make_movies
+    return movie_search.normalize_results({"description": make_movies("Benchmark", size, "http://127.0.0.1:9")})
+
+
+def _json_file(results):
+    return json.dumps(results).encode("utf-8")
+
+
+def _csv_file(results):
+    import exporter
+    return exporter.serialize("csv", results)
+
+
+# =================BENCHMARK MODUL=================
+
+def bench_search(runner, sizes):
+    import config
+    import movie_search
+    from benchmarks.fakes import make_movies
+
+    raw = {"description": make_movies("Normalisasi", 1000)}
+    runner.measure("search.normalize_results[1000]", lambda: movie_search.normalize_results(raw))
+
+    counter = iter(range(10 ** 6))
+    runner.measure(
+        "search.fetch_movies.cold",
+        lambda query: movie_search.fetch_movies(query),
+        setup=lambda: f"Dingin {next(counter)}",
+    )
+    movie_search.fetch_movies("Hangat")
+    runner.measure("search.fetch_movies.warm", lambda: movie_search.fetch_movies("Hangat"))
+
+    # Hasil basi tetap langsung dikembalikan; pembaruan berjalan di background
+    fresh_ttl = config.SEARCH_CACHE_TTL
+    config.SEARCH_CACHE_TTL = 0
+    try:
+        runner.measure("search.fetch_movies.stale", lambda: movie_search.fetch_movies("Hangat"))
+    finally:
+        config.SEARCH_CACHE_TTL = fresh_ttl
+
+
+def bench_import(runner, sizes):
+    import importer
+
+    for size in sizes:
+        results = _search_results(size)
+        for fmt, build in (("json", _json_file), ("csv", _csv_file)):
+            payload = build(results)
+            runner.measure(
+                f"import.{fmt}[{size}]",
+                lambda upload, fmt=fmt: importer.import_file(upload, fmt),
+                repeat=max(1, min(runner.repeat, 3)) if size >= 100000 else None,
+                setup=lambda payload=payload, fmt=fmt: _UploadedFile(payload, f"data.{fmt}"),
+                bytes=len(payload),
+            )
+
+
+def bench_export(runner, sizes):
+    import exporter
+
+    for size in sizes:
+        results = _search_results(size)
+        for fmt in exporter.FORMATS:
+            runner.measure(
+                f"export.{fmt}[{size}]",
+                lambda fmt=fmt: exporter.serialize(fmt, results),
+                repeat=max(1, min(runner.repeat, 3)) if size >= 100000 else None,
+                bytes=len(exporter.serialize(fmt, results)),
+            )
+        runner.measure(f"export.content_hash[{size}]", lambda: exporter.content_hash(results))
+
+
+def bench_catalog(runner, sizes):
+    import catalog
+
+    for size in sizes:
+        results = _search_results(size)
+        table = catalog.to_table(results)
+        movies = catalog.MovieCatalog()
+        runner.measure(f"catalog.set_source[{size}]", lambda: movies.set_source("import", table))
+        runner.measure(f"catalog.average_runtime[{size}]", movies.average_runtime)
+        # Pencarian baru di atas import besar: hanya delta pencarian yang digabung
+        search = catalog.to_table(results[:20])
+        runner.measure(f"catalog.set_search[{size}]", lambda: movies.set_source("search", search))
+
+        movie = results[size // 2]
+        labels = movies.labels()[:10]
+        runner.measure(f"catalog.comparison_frame[{size}]", lambda: movies.comparison_frame(movie, labels))
+
+        movies.sync_recommender()
+        runner.measure(f"catalog.recommend[{size}]", lambda: movies.recommend(movie))
+
+
+def bench_charts(runner, sizes):
+    import catalog
+    import charts
+
+    results = _search_results(1000)
+    movies = catalog.MovieCatalog()
+    movies.set_source("search", catalog.to_table(results))
+    frame, _ = movies.comparison_frame(results[0], movies.labels()[1:4])
+
+    def build():
+        charts.rating_pie(73)
+        charts.runtime_vs_average(120.0, 104.5)
+        charts.comparison_bar(frame, "Durasi (menit)", "Durasi (menit)")
+        charts.comparison_bar(frame, "Rating (%)", "Rating (%)", range_y=[0, 100])
+
+    runner.measure("charts.detail_figures.cold", lambda _: build(), setup=charts.clear)
+    runner.measure("charts.detail_figures.cached", build)
+
+
+def bench_suggest(runner, sizes):
+    import suggest
+
+    for size in sizes:
+        titles = [movie["title"] for movie in _search_results(size)]
+        index = suggest.TitleIndex(titles)
+        index.suggest("Bench")
+        runner.measure(f"suggest.prefix[{size}]", lambda: index.suggest("Benchmark 12"))
+        runner.measure(f"suggest.fuzzy[{size}]", lambda: index.suggest("Bencmark 12"))
+
+
+# =================BENCHMARK IMPORT MODUL=================
+
+# Dijalankan di interpreter baru: waktu run pertama halaman awal (termasuk
+# import modul aplikasi), lalu waktu import modul yang di-load belakangan.
+_IMPORT_PROBE = """
+import importlib, json, sys, time
+from streamlit import logger
+from streamlit.testing.v1 import AppTest
+logger.set_log_level("error")
+app = AppTest.from_file(sys.argv[1], default_timeout=60)
+app.secrets["APIKEY"] = "benchmark"
+start = time.perf_counter()
+app.run()
+timings = {"page.start.cold": time.perf_counter() - start}
+loaded = [name for name in ("google.generativeai", "plotly.express") if name in sys.modules]
+for name in ("views.search", "views.detail", "google.generativeai"):
+    start = time.perf_counter()
+    importlib.import_module(name)
+    timings[name] = time.perf_counter() - start
+print(json.dumps({"timings": timings, "loaded_on_start": loaded}))
+"""
+
+
+def bench_imports(runner, sizes):
+    samples = {}
+    loaded_on_start = set()
+    for _ in range(min(runner.repeat, _PAGE_REPEAT)):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE, _MAIN_SCRIPT],
+            cwd=_ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        loaded_on_start.update(probe["loaded_on_start"])
+        for name, seconds in probe["timings"].items():
+            samples.setdefault(name, []).append(seconds)
+
+    for name, values in samples.items():
+        extra = {"loaded_on_start": sorted(loaded_on_start)} if name == "page.start.cold" else {}
+        runner.record(f"imports.{name}", values, **extra)
+
+
+# =================BENCHMARK HALAMAN (AppTest)=================
+
+def _app(secrets_key="benchmark"):
+    from streamlit import logger as streamlit_logger
+    from streamlit.testing.v1 import AppTest
+
+    # Peringatan deprecation Streamlit di setiap run tidak relevan untuk hasil benchmark
+    # (di-set setelah import karena konfigurasi Streamlit mengatur ulang level log)
+    streamlit_logger.set_log_level("error")
+    app = AppTest.from_file(_MAIN_SCRIPT, default_timeout=60)
+    app.secrets["APIKEY"] = secrets_key
+    return app
+
+
+def _run_page(app):
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"Halaman gagal: {app.exception}")
+    return app
+
+
+def bench_pages(runner, sizes):
+    import importer
+
+    repeat = min(runner.repeat, _PAGE_REPEAT)
+
+    # Run pertama ikut meng-import modul aplikasi (diukur terpisah)
+    runner.measure("page.start.first_run", lambda: _run_page(_app()), repeat=1)
+    runner.measure("page.start", lambda: _run_page(_app()), repeat=repeat)
+
+    def search_app():
+        app = _app()
+        app.session_state.page = "search"
+        app.session_state.pending_search = "Halaman"
+        return app
+
+    _run_page(search_app())
+    runner.measure("page.search", _run_page, repeat=repeat, setup=search_app)
+
+    movie = _run_page(search_app()).session_state.search_results[1]
+
+    def detail_app():
+        app = _app()
+        app.session_state.page = "detail"
+        app.session_state.selected_movie = movie
+        return app
+
+    runner.measure("page.detail.cold", _run_page, repeat=1, setup=detail_app)
+    runner.measure("page.detail.warm", _run_page, repeat=repeat, setup=detail_app)
+
+    size = max(sizes)
+    imported = importer.import_file(_UploadedFile(_json_file(_search_results(size)), "data.json"), "json")
+
+    def import_view_app():
+        app = _app()
+        app.session_state.page = "import_view"
+        app.session_state.imported_data = imported
+        return app
+
+    runner.measure(f"page.import_view[{size}]", _run_page, repeat=repeat, setup=import_view_app)
+
+
+# =================MAIN=================
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _versions():
+    versions = {}
+    for name in ("streamlit", "pandas", "numpy", "pyarrow", "plotly", "requests", "PIL"):
+        try:
+            versions[name] = __import__(name).__version__
+        except Exception:
+            versions[name] = None
+    return versions
+
+
+def _compare(results, baseline_path, threshold):
+    """Mencetak perbandingan median dengan baseline; mengembalikan nama benchmark yang regresi."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f).get("results", {})
+
+    regressions = []
+    print(f"\nPerbandingan dengan {baseline_path}:")
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old or not old.get("median_ms"):
+            continue
+        ratio = result["median_ms"] / old["median_ms"]
+        flag = "  REGRESI" if ratio > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<45} {old['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline aplikasi Pencarian Film.")
+    parser.add_argument("--output", help="File JSON hasil (default: benchmarks/results/<waktu>-<commit>.json)")
+    parser.add_argument("--sizes", default="1000,100000", help="Jumlah baris untuk import/export/katalog")
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah pengulangan per benchmark")
+    parser.add_argument("--only", default="", help="Kelompok yang dijalankan, mis. search,import,pages")
+    parser.add_argument("--baseline", help="File JSON hasil lama untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Rasio median yang dianggap regresi")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--gemini-latency", type=float, default=0.0, help="Simulasi latensi Gemini (detik)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    groups = [group for group in args.only.split(",") if group] or list(_GROUPS)
+
+    from benchmarks import fake_genai
+    from benchmarks.fakes import FakeJustWatchServer
+
+    cache_dir = tempfile.mkdtemp(prefix="film-bench-")
+    with FakeJustWatchServer() as server:
+        # Konfigurasi harus di-set sebelum modul aplikasi di-import
+        os.environ["FILM_API_BASE_URL"] = server.url
+        os.environ["FILM_CACHE_DIR"] = cache_dir
+        os.environ["FILM_WARMUP_ENABLED"] = "0"
+        # Rate limit upstream dimatikan agar yang diukur hanya kode aplikasi
+        os.environ["FILM_JUSTWATCH_RATE_PER_SEC"] = "0"
+        os.environ["FILM_GEMINI_RATE_PER_SEC"] = "0"
+        # Poster disajikan server palsu di 127.0.0.1
+        os.environ["FILM_POSTER_ALLOW_PRIVATE_HOSTS"] = "1"
+        # Peringatan deprecation Gemini tidak relevan untuk hasil benchmark
+        warnings.simplefilter("ignore", FutureWarning)
+        sys.path.insert(0, _ROOT)
+        os.chdir(_ROOT)
+
+        import ai_service
+        ai_service.genai = fake_genai
+        ai_service.set_api_key("benchmark")
+        fake_genai.LATENCY = args.gemini_latency
+
+        runner = Runner(args.repeat)
+        started = time.perf_counter()
+        try:
+            for group in groups:
+                _GROUPS[group](runner, sizes)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    commit = _git_commit()
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": _versions(),
+        "settings": {"sizes": sizes, "repeat": args.repeat, "gemini_latency": args.gemini_latency},
+        "duration_s": round(time.perf_counter() - started, 2),
+        "results": runner.results,
+    }
+
+    output = args.output or os.path.join(
+        _ROOT, "benchmarks", "results",
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit or 'unknown'}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil disimpan ke {output}")
+
+    if args.baseline:
+        regressions = _compare(runner.results, args.baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+_GROUPS = {
+    "search": bench_search,
+    "import": bench_import,
+    "export": bench_export,
+    "catalog": bench_catalog,
+    "suggest": bench_suggest,
+    "charts": bench_charts,
+    "imports": bench_imports,
+    "pages": bench_pages,
+}
+
+
+if __name__ == "__main__":
+    sys.exit(main())
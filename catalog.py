@@ -0,0 +1,280 @@
+"""
+Katalog film per sesi (hasil pencarian + data import) dalam bentuk tabel bertipe.
+
+Data dari pencarian maupun import dinormalisasi sekali menjadi DataFrame
+dengan kolom numerik bertipe (`year` Int64, `runtime` dan `rating` float),
+lalu digabung menjadi satu tabel unik dengan key (judul ternormalisasi,
+tahun). Bagian import (key, label, total durasi) disiapkan sekali per import;
+setiap pencarian hanya menggabungkan delta hasil pencarian di atasnya.
+Rata-rata durasi, pencarian film dan data grafik perbandingan
+dihitung dengan seleksi vektor, tidak dengan loop + try/except per film
+di setiap rerun.
+"""
+import numpy as np
+import pandas as pd
+
+import metrics
+import recommender
+from utils import normalize_title
+
+# Urutan prioritas sumber data: jika film ada di keduanya, data hasil pencarian dipakai
+SOURCES = ("search", "import")
+
+# Kolom teks dan kolom numerik pada tabel bertipe
+TEXT_COLUMNS = ["title", "overview", "poster", "link"]
+NUMERIC_COLUMNS = ["runtime", "jwRating", "tomatometer"]
+TABLE_COLUMNS = ["title", "year", "runtime", "jwRating", "tomatometer", "rating", "overview", "poster", "link"]
+
+
+def _numeric(series) -> pd.Series:
+    return pd.to_numeric(series, errors="coerce").astype("float64")
+
+
+def to_table(data) -> pd.DataFrame:
+    """
+    Normalisasi list of dict / DataFrame mentah menjadi tabel bertipe:
+    `year` Int64, `runtime`/`jwRating`/`tomatometer`/`rating` float, sisanya string.
+    `rating` = JustWatch (0-1) x 100, fallback ke Tomatometer (%) jika 0/kosong.
+    """
+    if isinstance(data, pd.DataFrame):
+        frame = data.reindex(columns=TABLE_COLUMNS)
+    else:
+        frame = pd.DataFrame.from_records(
+            [row for row in data if isinstance(row, dict)] if data is not None else [],
+            columns=TABLE_COLUMNS,
+        )
+
+    table = pd.DataFrame(index=frame.index)
+    for col in TEXT_COLUMNS:
+        text = frame[col].astype("string[pyarrow]")
+        table[col] = text.mask(text == "")
+    table["year"] = _numeric(frame["year"]).round().astype("Int64")
+    for col in NUMERIC_COLUMNS:
+        table[col] = _numeric(frame[col])
+
+    runtime = table["runtime"].fillna(0)
+    table["runtime"] = runtime.where(runtime > 0, 0.0)
+    jw_percent = table["jwRating"].fillna(0) * 100
+    table["rating"] = jw_percent.where(jw_percent != 0, table["tomatometer"].fillna(0))
+    return table[TABLE_COLUMNS]
+
+
+def _year_key(year) -> str:
+    try:
+        return str(int(round(float(year))))
+    except (ValueError, TypeError):
+        return ""
+
+
+def movie_key(movie) -> str:
+    """Key katalog untuk sebuah film (dict): 'judul ternormalisasi|tahun'."""
+    return f"{normalize_title(movie.get('title'))}|{_year_key(movie.get('year'))}"
+
+
+def _table_keys(table) -> pd.Series:
+    titles = (
+        table["title"].fillna("")
+        .str.replace(r"\s+", " ", regex=True).str.strip().str.casefold()
+    )
+    years = table["year"].astype("string").fillna("")
+    return (titles + "|" + years).astype(object)
+
+
+def _labels(table) -> pd.Series:
+    """Label tampilan: judul, ditambah tahun untuk judul kembar, dan nomor jika masih bentrok."""
+    labels = table["title"].astype(object)
+    duplicated = labels.duplicated(keep="first")
+    if duplicated.any():
+        years = table["year"].astype("string").fillna("?").astype(object)
+        labels = labels.where(~duplicated, labels + " (" + years + ")")
+        counter = labels.groupby(labels).cumcount()
+        labels = labels.where(counter == 0, labels + " #" + (counter + 1).astype(str))
+    return labels
+
+
+def _prepare_part(table) -> pd.DataFrame:
+    """Baris berjudul dari satu sumber, dengan kolom `key` dan tanpa key ganda."""
+    part = table[table["title"].fillna("") != ""]
+    part = part.assign(key=_table_keys(part))
+    return part.drop_duplicates("key", keep="first").reset_index(drop=True)
+
+
+class MovieCatalog:
+    """Tabel film unik (pencarian + import) dengan index label dan key."""
+
+    def __init__(self):
+        self._parts = {source: _prepare_part(to_table([])) for source in SOURCES}
+        self._recommender = recommender.LocalRecommender()
+        self._index_import()
+        self._merge()
+
+    def __len__(self):
+        return len(self._table)
+
+    # --- Pemeliharaan tabel ---
+
+    def set_source(self, source: str, movies):
+        """
+        Mengganti semua film dari satu sumber ("search" atau "import").
+        `movies` boleh list of dict atau tabel hasil `to_table` (tidak dinormalisasi ulang).
+        Hanya sumber yang berubah yang dinormalisasi ulang; bagian import beserta
+        key, label dan total durasinya disimpan dan dipakai ulang di setiap pencarian.
+        """
+        if isinstance(movies, pd.DataFrame) and list(movies.columns) == TABLE_COLUMNS:
+            table = movies
+        elif movies is None or isinstance(movies, dict):
+            table = to_table([])
+        else:
+            table = to_table(movies)
+        self._parts[source] = _prepare_part(table)
+        if source == "import":
+            self._index_import()
+        self._merge()
+
+    def _index_import(self):
+        """Key, judul, label dan total durasi bagian import (sekali per import, O(n))."""
+        base = self._parts["import"]
+        self._import_keys = pd.Index(base["key"])
+        # Posisi baris import per judul (dikelompokkan), untuk mencari judul kembar dengan pencarian
+        codes, titles = pd.factorize(base["title"].astype(object))
+        self._import_titles = pd.Index(titles, dtype=object)
+        self._import_title_codes = codes
+        self._import_by_title = np.argsort(codes, kind="stable")
+        self._import_title_ptr = np.searchsorted(codes[self._import_by_title], np.arange(len(titles) + 1))
+        self._import_base_labels = _labels(base).to_numpy(dtype=object)
+        self._import_label_index = pd.Index(self._import_base_labels, dtype=object)
+        self._import_runtime = base["runtime"].to_numpy(dtype="float64")
+        has_runtime = self._import_runtime > 0
+        self._import_runtime_sum = float(self._import_runtime[has_runtime].sum())
+        self._import_runtime_count = int(has_runtime.sum())
+
+    def _merge(self):
+        """
+        Gabung hasil pencarian di atas bagian import. Hanya delta pencarian yang
+        dihitung: baris import dengan key yang sama dibuang, total durasi dikurangi
+        baris itu lalu ditambah durasi hasil pencarian, dan label dihitung ulang
+        hanya untuk grup judul yang bersinggungan dengan hasil pencarian.
+        """
+        search, base = self._parts["search"], self._parts["import"]
+        keep = np.ones(len(base), dtype=bool)
+        overridden = self._import_keys.get_indexer(search["key"])
+        overridden = overridden[overridden >= 0]
+        keep[overridden] = False
+
+        search_runtime = search["runtime"].to_numpy(dtype="float64")
+        dropped_runtime = self._import_runtime[overridden]
+        self._runtime_sum = (
+            self._import_runtime_sum
+            - float(dropped_runtime[dropped_runtime > 0].sum())
+            + float(search_runtime[search_runtime > 0].sum())
+        )
+        self._runtime_count = (
+            self._import_runtime_count - int((dropped_runtime > 0).sum()) + int((search_runtime > 0).sum())
+        )
+
+        # Judul kembar dengan hasil pencarian atau dengan baris yang dibuang: label grup itu
+        # dihitung ulang (pencarian lebih dulu); label film import lainnya tetap
+        shared = self._import_titles.get_indexer(pd.unique(search["title"].astype(object)))
+        shared = np.union1d(shared[shared >= 0], self._import_title_codes[overridden])
+        affected = np.sort(np.concatenate([np.zeros(0, dtype=np.int64)] + [
+            self._import_by_title[self._import_title_ptr[title]:self._import_title_ptr[title + 1]]
+            for title in shared
+        ]))
+        affected = affected[keep[affected]]
+        import_labels = self._import_base_labels.copy()
+        group = pd.concat([search[["title", "year"]], base.iloc[affected][["title", "year"]]], ignore_index=True)
+        group_labels = _labels(group).to_numpy(dtype=object)
+        search_labels = group_labels[:len(search)]
+        import_labels[affected] = group_labels[len(search):]
+
+        # Label baru bentrok dengan label import lain yang tidak berubah: hitung ulang semuanya
+        # (atau label import sendiri sudah tidak unik, mis. judul asli "X #2")
+        untouched = keep.copy()
+        untouched[affected] = False
+        if self._import_label_index.is_unique:
+            clash = self._import_label_index.get_indexer(group_labels)
+            relabel_all = untouched[clash[clash >= 0]].any()
+        else:
+            relabel_all = True
+
+        # Potongan bagian import di antara baris yang dibuang (tanpa menyaring seluruh kolom)
+        dropped = np.sort(overridden)
+        bounds = zip(np.concatenate([[0], dropped + 1]), np.concatenate([dropped, [len(base)]]))
+        combined = pd.concat([search] + [base.iloc[start:end] for start, end in bounds], ignore_index=True)
+        if relabel_all:
+            labels = _labels(combined).to_numpy(dtype=object)
+            search_labels = labels[:len(search)]
+            import_labels[keep] = labels[len(search):]
+        combined.index = pd.Index(
+            np.concatenate([search_labels, import_labels[keep]]), dtype=object, name="label"
+        )
+        self._table = combined
+        self._search_label_by_key = dict(zip(search["key"], search_labels))
+        self._import_labels = import_labels
+
+    # --- Query ---
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """Tabel film unik, index = label tampilan."""
+        return self._table
+
+    def average_runtime(self) -> float:
+        """Durasi rata-rata semua film unik yang punya durasi (O(1))."""
+        if not self._runtime_count:
+            return 0
+        return self._runtime_sum / self._runtime_count
+
+    def find_label(self, movie):
+        """Label katalog untuk film ini, atau None jika tidak ada di katalog."""
+        key = movie_key(movie)
+        label = self._search_label_by_key.get(key)
+        if label is None:
+            # Key yang ada di hasil pencarian sudah tertangani di atas, jadi baris import ini tidak dibuang
+            position = self._import_keys.get_indexer([key])[0]
+            if position >= 0:
+                label = self._import_labels[position]
+        return label
+
+    def labels(self):
+        """Semua label film (untuk pilihan multiselect)."""
+        return self._table.index.tolist()
+
+    def sync_recommender(self):
+        """Memperbarui index rekomendasi lokal dengan tabel terbaru (aman dipanggil dari thread lain)."""
+        self._recommender.sync(*(self._parts[source] for source in SOURCES))
+
+    def recommend(self, movie, k=None):
+        """Rekomendasi lokal untuk film ini, atau None jika katalog belum cukup (fallback ke Gemini)."""
+        with metrics.span("recommend_local"):
+            self.sync_recommender()
+            recommendations = self._recommender.recommend(movie_key(movie), k)
+        metrics.record_cache("local_recommendations", recommendations is not None)
+        return recommendations
+
+    def comparison_frame(self, movie, labels):
+        """
+        DataFrame grafik perbandingan untuk film ini + film pilihan (seleksi vektor, O(k)).
+        Mengembalikan (df dengan kolom Film / Durasi (menit) / Rating (%), skipped_labels).
+        """
+        current_label = self.find_label(movie)
+        if current_label is None:
+            # Film yang sedang dilihat belum ada di katalog: normalisasi satu baris saja
+            current_label = movie.get("title")
+            current = to_table([movie])[["runtime", "rating"]]
+            current.index = pd.Index([current_label], name="label")
+        else:
+            current = self._table.loc[[current_label], ["runtime", "rating"]]
+
+        others = [label for label in labels if label != current_label and label in self._table.index]
+        selected = pd.concat([current, self._table.loc[others, ["runtime", "rating"]]])
+
+        has_data = (selected["runtime"] > 0) | (selected["rating"] > 0)
+        skipped = selected.index[~has_data].tolist()
+        df = (
+            selected[has_data]
+            .rename(columns={"runtime": "Durasi (menit)", "rating": "Rating (%)"})
+            .rename_axis("Film")
+            .reset_index()
+        )
+        return df, skipped
@@ -0,0 +1,104 @@
+"""
+Grafik Plotly halaman detail, dibuat sekali per data lalu dipakai ulang.
+
+Membuat figure dengan Plotly Express (validasi, template, trace per warna)
+jauh lebih mahal daripada mengirimnya ke browser. Figure disimpan di cache
+LRU per proses dengan key berisi data yang digambar (rating, durasi, rata-rata,
+judul film pembanding beserta nilainya), jadi rerun dan sesi lain yang
+menampilkan data sama langsung memakai figure yang sudah jadi.
+
+Figure dari modul ini dipakai bersama: jangan diubah setelah diambil.
+"""
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.express as px
+
+import config
+import metrics
+
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+def cached_figure(key: tuple, build):
+    """Figure untuk `key` dari cache, atau hasil `build()` yang lalu disimpan (LRU, CHART_CACHE_SIZE entri)."""
+    with _figures_lock:
+        figure = _figures.get(key)
+        if figure is not None:
+            _figures.move_to_end(key)
+    metrics.record_cache("charts", figure is not None)
+    if figure is not None:
+        return figure
+
+    with metrics.span("chart_build", chart=key[0]):
+        figure = build()
+    with _figures_lock:
+        _figures[key] = figure
+        _figures.move_to_end(key)
+        while len(_figures) > config.CHART_CACHE_SIZE:
+            _figures.popitem(last=False)
+    return figure
+
+
+def clear():
+    with _figures_lock:
+        _figures.clear()
+
+
+def rating_pie(percent: int):
+    """Donat Like/Dislike dari rating JustWatch (persen)."""
+    def build():
+        data = pd.DataFrame({"values": ["Like", "Dislike"], "category": [percent, 100 - percent]})
+        return px.pie(data, values="category", names="values", hole=0.5, color_discrete_sequence=['#4CAF50', '#FF5722'])
+
+    return cached_figure(("jw_rating_pie", percent), build)
+
+
+def runtime_vs_average(runtime: float, average: float):
+    """Bar durasi film ini dibanding rata-rata durasi katalog."""
+    def build():
+        data = pd.DataFrame({
+            "Kategori": ["Film Ini", "Rata-rata"],
+            "Durasi": [runtime, average]
+        })
+        figure = px.bar(
+            data,
+            x="Kategori",
+            y="Durasi",
+            color="Kategori",
+            color_discrete_map={
+                "Film Ini": "#2196F3", # Biru
+                "Rata-rata": "#FFC107" # Kuning
+            },
+            text_auto=True,
+            title="Durasi (menit)"
+        )
+        figure.update_layout(
+            showlegend=False,
+            margin=dict(t=50, b=0, l=0, r=0), # Kurangi margin atas
+            height=250 # Atur tinggi agar lebih ringkas
+        )
+        figure.update_traces(marker_line_width=0)
+        return figure
+
+    return cached_figure(("runtime_vs_average", runtime, average), build)
+
+
+def comparison_bar(frame, column: str, title: str, range_y=None):
+    """Bar per film untuk kolom `column` dari frame perbandingan (catalog.comparison_frame)."""
+    def build():
+        figure = px.bar(frame, x="Film", y=column, color="Film", title=title, range_y=range_y)
+        figure.update_layout(showlegend=False)
+        return figure
+
+    key = (
+        "comparison",
+        column,
+        title,
+        tuple(range_y) if range_y else None,
+        tuple(frame["Film"]),
+        tuple(frame[column].tolist()),
+    )
+    return cached_figure(key, build)
@@ -0,0 +1,206 @@
+"""
+Konfigurasi performa aplikasi.
+Semua nilai bisa di-override lewat environment variable tanpa mengubah kode.
+"""
+import os
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_list(name: str, default):
+    value = os.environ.get(name)
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# =================HTTP CLIENT (JustWatch/IMDb)=================
+
+API_BASE_URL = os.environ.get("FILM_API_BASE_URL", "https://imdb.iamidiotareyoutoo.com")
+
+# Jumlah host yang di-pool dan jumlah koneksi keep-alive per host
+HTTP_POOL_CONNECTIONS = _env_int("FILM_HTTP_POOL_CONNECTIONS", 4)
+HTTP_POOL_MAXSIZE = _env_int("FILM_HTTP_POOL_MAXSIZE", 20)
+
+# Timeout (detik): connect terpisah dari read supaya host mati cepat ketahuan
+HTTP_CONNECT_TIMEOUT = _env_float("FILM_HTTP_CONNECT_TIMEOUT", 3.05)
+HTTP_READ_TIMEOUT = _env_float("FILM_HTTP_READ_TIMEOUT", 8)
+
+# =================CACHE=================
+
+# Jumlah maksimum entri cache offer streaming (per judul/URL) di memori proses
+OFFER_CACHE_SIZE = _env_int("FILM_OFFER_CACHE_SIZE", 2000)
+
+# Jumlah maksimum figure Plotly halaman detail yang disimpan di memori proses (charts.py)
+CHART_CACHE_SIZE = _env_int("FILM_CHART_CACHE_SIZE", 256)
+
+# Folder untuk cache persisten (SQLite), dipakai bersama semua worker process
+CACHE_DIR = os.environ.get("FILM_CACHE_DIR", os.path.join(_APP_DIR, ".cache"))
+
+# Cache hasil pencarian JustWatch: TTL (detik) dan batas ukuran total (byte).
+# Setelah TTL lewat, hasil lama tetap langsung dipakai sambil diperbarui di
+# background (stale-while-revalidate) sampai HARD_TTL; setelah itu dibuang.
+SEARCH_CACHE_TTL = _env_float("FILM_SEARCH_CACHE_TTL", 6 * 60 * 60)
+SEARCH_CACHE_HARD_TTL = _env_float("FILM_SEARCH_CACHE_HARD_TTL", 7 * 24 * 60 * 60)
+SEARCH_CACHE_MAX_BYTES = _env_int("FILM_SEARCH_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Cache hasil Gemini (rekomendasi & deskripsi): TTL (detik) dan batas ukuran (byte)
+GEMINI_CACHE_TTL = _env_float("FILM_GEMINI_CACHE_TTL", 7 * 24 * 60 * 60)
+GEMINI_CACHE_MAX_BYTES = _env_int("FILM_GEMINI_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+
+# Cache thumbnail poster (JPEG kecil): TTL (detik) dan batas ukuran (byte)
+POSTER_CACHE_TTL = _env_float("FILM_POSTER_CACHE_TTL", 30 * 24 * 60 * 60)
+POSTER_CACHE_MAX_BYTES = _env_int("FILM_POSTER_CACHE_MAX_BYTES", 128 * 1024 * 1024)
+# URL poster yang gagal diunduh tidak dicoba lagi selama ini (detik)
+POSTER_FAILURE_TTL = _env_float("FILM_POSTER_FAILURE_TTL", 60 * 60)
+
+# =================CONCURRENCY=================
+
+# Jumlah thread untuk panggilan eksternal paralel di halaman detail
+DETAIL_FETCH_WORKERS = _env_int("FILM_DETAIL_FETCH_WORKERS", 8)
+# Selang (detik) bagian halaman detail memeriksa apakah data eksternalnya sudah datang
+DETAIL_POLL_INTERVAL = _env_float("FILM_DETAIL_POLL_INTERVAL", 1.0)
+
+# Batch sinopsis AI untuk hasil pencarian tanpa overview
+GEMINI_BATCH_SIZE = _env_int("FILM_GEMINI_BATCH_SIZE", 15)
+GEMINI_BATCH_WORKERS = _env_int("FILM_GEMINI_BATCH_WORKERS", 2)
+
+# Thread untuk memperbarui hasil pencarian yang basi di background
+SEARCH_REFRESH_WORKERS = _env_int("FILM_SEARCH_REFRESH_WORKERS", 2)
+
+# =================BATAS REQUEST UPSTREAM=================
+
+# Token bucket per upstream: laju (request/detik, 0 = tanpa batas), burst, dan
+# lama antre maksimum (detik) sebelum request ditolak
+JUSTWATCH_RATE_PER_SEC = _env_float("FILM_JUSTWATCH_RATE_PER_SEC", 5)
+JUSTWATCH_RATE_BURST = _env_float("FILM_JUSTWATCH_RATE_BURST", 10)
+JUSTWATCH_RATE_MAX_WAIT = _env_float("FILM_JUSTWATCH_RATE_MAX_WAIT", 3)
+GEMINI_RATE_PER_SEC = _env_float("FILM_GEMINI_RATE_PER_SEC", 1)
+GEMINI_RATE_BURST = _env_float("FILM_GEMINI_RATE_BURST", 5)
+GEMINI_RATE_MAX_WAIT = _env_float("FILM_GEMINI_RATE_MAX_WAIT", 10)
+
+# =================CIRCUIT BREAKER & RETRY=================
+
+# Circuit terbuka jika minimal MIN_CALLS dari WINDOW panggilan terakhir ke satu
+# upstream tercatat dan rasio gagalnya >= FAILURE_RATE. Selama OPEN_SECONDS
+# panggilan langsung gagal (halaman menampilkan versi terbatas), lalu satu
+# panggilan percobaan menentukan apakah circuit ditutup lagi.
+BREAKER_WINDOW = _env_int("FILM_BREAKER_WINDOW", 20)
+BREAKER_MIN_CALLS = _env_int("FILM_BREAKER_MIN_CALLS", 5)
+BREAKER_FAILURE_RATE = _env_float("FILM_BREAKER_FAILURE_RATE", 0.5)
+BREAKER_OPEN_SECONDS = _env_float("FILM_BREAKER_OPEN_SECONDS", 30)
+
+# Retry per panggilan, backoff eksponensial dengan jitter (detik), dan anggaran
+# retry: setiap panggilan menambah RATIO token (maks. MAX), satu retry memakai satu token
+UPSTREAM_MAX_RETRIES = _env_int("FILM_UPSTREAM_MAX_RETRIES", 1)
+RETRY_BACKOFF_BASE = _env_float("FILM_RETRY_BACKOFF_BASE", 0.2)
+RETRY_BACKOFF_MAX = _env_float("FILM_RETRY_BACKOFF_MAX", 2)
+RETRY_BUDGET_RATIO = _env_float("FILM_RETRY_BUDGET_RATIO", 0.2)
+RETRY_BUDGET_MAX = _env_float("FILM_RETRY_BUDGET_MAX", 10)
+# Timeout tidak pernah di-retry; kegagalan lain hanya di-retry jika sejak
+# percobaan pertama belum lewat RETRY_MAX_ELAPSED detik
+RETRY_MAX_ELAPSED = _env_float("FILM_RETRY_MAX_ELAPSED", 2)
+
+# Batas waktu satu panggilan Gemini (detik); batch sinopsis boleh lebih lama
+GEMINI_TIMEOUT = _env_float("FILM_GEMINI_TIMEOUT", 20)
+GEMINI_BATCH_TIMEOUT = _env_float("FILM_GEMINI_BATCH_TIMEOUT", 60)
+
+# =================POSTER=================
+
+# Thread untuk mengunduh poster yang belum ada di cache
+POSTER_FETCH_WORKERS = _env_int("FILM_POSTER_FETCH_WORKERS", 8)
+# Batas waktu baca (detik) dan ukuran file poster asli (byte)
+POSTER_FETCH_TIMEOUT = _env_float("FILM_POSTER_FETCH_TIMEOUT", 5)
+POSTER_MAX_SOURCE_BYTES = _env_int("FILM_POSTER_MAX_SOURCE_BYTES", 10 * 1024 * 1024)
+# URL poster berasal dari data luar, jadi host yang mengarah ke alamat internal
+# (loopback, jaringan privat, link-local, dsb.) ditolak. Aktifkan hanya untuk
+# pengujian dengan server poster lokal.
+POSTER_ALLOW_PRIVATE_HOSTS = _env_bool("FILM_POSTER_ALLOW_PRIVATE_HOSTS", False)
+POSTER_MAX_REDIRECTS = _env_int("FILM_POSTER_MAX_REDIRECTS", 3)
+# Kualitas JPEG untuk thumbnail
+POSTER_JPEG_QUALITY = _env_int("FILM_POSTER_JPEG_QUALITY", 82)
+
+# =================WARM-UP=================
+
+# Query "Film Populer" di halaman awal, sekaligus yang di-warm-up saat proses start
+POPULAR_QUERIES = _env_list("FILM_POPULAR_QUERIES", ["Avengers", "Spider Man", "Batman", "Avatar", "Iron Man"])
+
+WARMUP_ENABLED = _env_bool("FILM_WARMUP_ENABLED", True)
+# Jumlah query yang di-warm-up bersamaan
+WARMUP_WORKERS = _env_int("FILM_WARMUP_WORKERS", 2)
+# Berapa film teratas per query yang rekomendasinya ikut di-warm-up (0 = tidak ada)
+WARMUP_RECOMMENDATIONS_PER_QUERY = _env_int("FILM_WARMUP_RECOMMENDATIONS_PER_QUERY", 1)
+
+# =================IMPORT=================
+
+# Jumlah baris per batch normalisasi dan jumlah karakter per potongan baca JSON
+IMPORT_CHUNK_ROWS = _env_int("FILM_IMPORT_CHUNK_ROWS", 5000)
+IMPORT_CHUNK_CHARS = _env_int("FILM_IMPORT_CHUNK_CHARS", 1024 * 1024)
+# Jumlah maksimum film yang dirender di halaman "Data Film yang Diimport"
+IMPORT_VIEW_LIMIT = _env_int("FILM_IMPORT_VIEW_LIMIT", 100)
+
+# =================SARAN JUDUL=================
+
+# Jumlah saran yang ditampilkan, panjang minimal input, dan skor fuzzy minimal (0-1)
+SUGGEST_LIMIT = _env_int("FILM_SUGGEST_LIMIT", 6)
+SUGGEST_MIN_CHARS = _env_int("FILM_SUGGEST_MIN_CHARS", 2)
+SUGGEST_MIN_SCORE = _env_float("FILM_SUGGEST_MIN_SCORE", 0.3)
+# Trigram yang dimiliki lebih dari sekian judul tidak dipakai untuk mencari kandidat fuzzy,
+# dan paling banyak sekian kandidat (yang paling banyak berbagi trigram jarang) dinilai
+SUGGEST_MAX_POSTINGS = _env_int("FILM_SUGGEST_MAX_POSTINGS", 2000)
+SUGGEST_MAX_CANDIDATES = _env_int("FILM_SUGGEST_MAX_CANDIDATES", 500)
+
+# =================REKOMENDASI LOKAL=================
+
+# Jumlah rekomendasi, ukuran katalog minimal, dan kemiripan teks minimal (0-1)
+# agar rekomendasi lokal dipakai; jika tidak terpenuhi, Gemini dipakai
+RECOMMENDER_TOP_K = _env_int("FILM_RECOMMENDER_TOP_K", 6)
+RECOMMENDER_MIN_CATALOG = _env_int("FILM_RECOMMENDER_MIN_CATALOG", 20)
+RECOMMENDER_MIN_TEXT_SIMILARITY = _env_float("FILM_RECOMMENDER_MIN_TEXT_SIMILARITY", 0.05)
+# Bobot kemiripan overview/judul dibanding fitur tahun/durasi/rating
+RECOMMENDER_TEXT_WEIGHT = _env_float("FILM_RECOMMENDER_TEXT_WEIGHT", 0.8)
+
+# =================GRID PENCARIAN=================
+
+# Jumlah kartu film per halaman hasil pencarian (kelipatan 3 agar baris penuh)
+SEARCH_PAGE_SIZE = _env_int("FILM_SEARCH_PAGE_SIZE", 12)
+SEARCH_CARDS_PER_ROW = _env_int("FILM_SEARCH_CARDS_PER_ROW", 3)
+
+# =================METRIK & DEBUG=================
+
+# File metrik (kosong = tidak ditulis), formatnya "prometheus" atau "jsonl",
+# dan interval minimal antar penulisan (detik)
+METRICS_FILE = os.environ.get("FILM_METRICS_FILE", "")
+METRICS_FORMAT = os.environ.get("FILM_METRICS_FORMAT", "prometheus").strip().lower()
+METRICS_FLUSH_INTERVAL = _env_float("FILM_METRICS_FLUSH_INTERVAL", 15)
+# Panel debug performa di sidebar. Metrik berlaku untuk seluruh proses (semua sesi),
+# jadi panel hanya bisa diaktifkan dari server, tidak lewat parameter URL
+DEBUG_PANEL = _env_bool("FILM_DEBUG_PANEL", False)
+
+# =================EXPORT=================
+
+# Jumlah film per chunk saat menulis file export
+EXPORT_CHUNK_ROWS = _env_int("FILM_EXPORT_CHUNK_ROWS", 5000)
+# Batas total ukuran file export yang di-memo di memori proses (byte)
+EXPORT_CACHE_MAX_BYTES = _env_int("FILM_EXPORT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
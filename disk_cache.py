@@ -0,0 +1,198 @@
+"""
+Cache persisten berbasis SQLite.
+
+Satu file database dipakai bersama oleh semua worker process di host yang
+sama (mode WAL), tetap ada setelah restart/redeploy, dan payload disimpan
+dalam bentuk JSON yang dikompres zlib (atau bytes mentah lewat
+`get_bytes`/`set_bytes`). Setiap entri punya TTL; bila total
+ukuran melebihi batas, entri yang paling lama tidak diakses (LRU) dibuang.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at);
+"""
+
+
+class DiskCache:
+    """Cache key -> nilai JSON dengan TTL dan batas ukuran (LRU)."""
+
+    def __init__(self, path: str, default_ttl: float, max_bytes: int):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Koneksi SQLite tidak boleh dipakai lintas thread, jadi satu per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decode(blob: bytes):
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def _get_row(self, key: str):
+        """(blob, created_at) untuk entri yang belum kedaluwarsa, atau None."""
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, created_at, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        blob, created_at, expires_at = row
+        if expires_at <= now:
+            with conn:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return None
+        with conn:
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return blob, created_at
+
+    def _get_blob(self, key: str):
+        row = self._get_row(key)
+        return None if row is None else row[0]
+
+    def _set_blob(self, key: str, blob: bytes, ttl):
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now + ttl, now),
+            )
+        self._evict(conn, now)
+
+    def get(self, key: str, default=None):
+        """Mengambil nilai yang belum kedaluwarsa, atau `default`."""
+        try:
+            blob = self._get_blob(key)
+            return default if blob is None else self._decode(blob)
+        except (sqlite3.Error, zlib.error, ValueError):
+            return default
+
+    def get_entry(self, key: str):
+        """
+        (nilai, created_at) untuk entri yang belum kedaluwarsa, atau None. Dipakai
+        pemanggil yang menentukan sendiri kapan entri dianggap basi (stale-while-revalidate).
+        """
+        try:
+            row = self._get_row(key)
+            return None if row is None else (self._decode(row[0]), row[1])
+        except (sqlite3.Error, zlib.error, ValueError):
+            return None
+
+    def set(self, key: str, value, ttl=None):
+        """Menyimpan nilai (harus bisa di-serialize ke JSON)."""
+        blob = self._encode(value)
+        try:
+            self._set_blob(key, blob, ttl)
+        except sqlite3.Error:
+            pass
+
+    def get_bytes(self, key: str, default=None):
+        """Seperti `get`, untuk data biner mentah (mis. gambar) yang disimpan dengan `set_bytes`."""
+        try:
+            blob = self._get_blob(key)
+            return default if blob is None else bytes(blob)
+        except sqlite3.Error:
+            return default
+
+    def set_bytes(self, key: str, value: bytes, ttl=None):
+        """Menyimpan bytes apa adanya (tanpa JSON/zlib, cocok untuk data yang sudah terkompresi)."""
+        try:
+            self._set_blob(key, value, ttl)
+        except sqlite3.Error:
+            pass
+
+    def iter_values(self, key_prefix: str = ""):
+        """Semua nilai yang belum kedaluwarsa dengan key berawalan `key_prefix` (tanpa mengubah urutan LRU)."""
+        try:
+            rows = self._connect().execute(
+                "SELECT value FROM cache WHERE key >= ? AND key < ? AND expires_at > ?",
+                (key_prefix, key_prefix + "\uffff", time.time()),
+            ).fetchall()
+        except sqlite3.Error:
+            return
+        for (blob,) in rows:
+            try:
+                yield self._decode(blob)
+            except (zlib.error, ValueError):
+                continue
+
+    def delete(self, key: str):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM cache")
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Buang entri kedaluwarsa, lalu entri LRU sampai total ukuran di bawah batas."""
+        with conn:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            excess = total - self.max_bytes
+            victims = []
+            for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str, default_ttl: float, max_bytes: int) -> DiskCache:
+    """Mengembalikan instance DiskCache bersama untuk `name` (satu file per nama)."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            path = os.path.join(config.CACHE_DIR, f"{name}.sqlite3")
+            cache = DiskCache(path, default_ttl=default_ttl, max_bytes=max_bytes)
+            _caches[name] = cache
+        return cache
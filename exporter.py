@@ -0,0 +1,165 @@
+"""
+Export hasil pencarian ke JSON, CSV, Parquet dan Arrow IPC.
+
+Parquet dan Arrow memakai skema ternormalisasi yang sama dengan import
+(title, year, runtime, jwRating, tomatometer, overview, poster, link)
+dengan tipe kolom yang jelas, sehingga round-trip antar environment lebih
+cepat di-parse dan lebih kecil di disk dibanding JSON/CSV.
+
+File export dibuat secara lazy (hanya ketika tombol download diklik),
+ditulis per chunk, dan di-memo berdasarkan hash isi hasil pencarian.
+"""
+import csv
+import hashlib
+import io
+import json
+import textwrap
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import catalog
+import config
+import metrics
+
+EXPORT_COLUMNS = ["title", "year", "runtime", "jwRating", "tomatometer", "overview", "poster", "link"]
+
+EXPORT_SCHEMA = pa.schema([
+    ("title", pa.string()),
+    ("year", pa.int32()),
+    ("runtime", pa.float64()),
+    ("jwRating", pa.float64()),
+    ("tomatometer", pa.float64()),
+    ("overview", pa.string()),
+    ("poster", pa.string()),
+    ("link", pa.string()),
+])
+
+# Label tombol, ekstensi file dan MIME type untuk setiap format download
+FORMATS = {
+    "json": ("JSON", "json", "application/json"),
+    "csv": ("CSV", "csv", "text/csv"),
+    "parquet": ("Parquet", "parquet", "application/vnd.apache.parquet"),
+    "arrow": ("Arrow", "arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def to_arrow_table(results) -> pa.Table:
+    """Hasil pencarian (list of dict) -> pyarrow.Table dengan EXPORT_SCHEMA."""
+    table = catalog.to_table(results)[EXPORT_COLUMNS]
+    return pa.Table.from_pandas(table, schema=EXPORT_SCHEMA, preserve_index=False)
+
+
+def _chunks(results, chunk_rows):
+    for start in range(0, len(results), chunk_rows):
+        yield results[start:start + chunk_rows]
+
+
+def write_json(results, stream, chunk_rows):
+    """Sama dengan json.dumps(results, indent=2), tetapi ditulis per film ke `stream` (teks)."""
+    if not results:
+        stream.write("[]")
+        return
+    stream.write("[\n")
+    first = True
+    for chunk in _chunks(results, chunk_rows):
+        parts = []
+        for item in chunk:
+            parts.append(("" if first else ",\n") + textwrap.indent(json.dumps(item, indent=2), "  "))
+            first = False
+        stream.write("".join(parts))
+    stream.write("\n]")
+
+
+def write_csv(results, stream, chunk_rows):
+    # Ambil semua keys unik dari semua hasil sebagai fieldnames
+    all_keys = set()
+    for item in results:
+        all_keys.update(item.keys())
+    # Offers berupa list bersarang, tidak cocok untuk kolom CSV
+    all_keys.discard("offers")
+
+    writer = csv.DictWriter(stream, fieldnames=list(all_keys), extrasaction="ignore")
+    writer.writeheader()
+    for chunk in _chunks(results, chunk_rows):
+        writer.writerows(chunk)
+
+
+def write_parquet(results, sink, chunk_rows):
+    with pq.ParquetWriter(sink, EXPORT_SCHEMA, compression="zstd") as writer:
+        for chunk in _chunks(results, chunk_rows):
+            writer.write_table(to_arrow_table(chunk))
+
+
+def write_arrow(results, sink, chunk_rows):
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.ipc.new_file(sink, EXPORT_SCHEMA, options=options) as writer:
+        for chunk in _chunks(results, chunk_rows):
+            writer.write_table(to_arrow_table(chunk))
+
+
+_WRITERS = {
+    "json": (write_json, True),
+    "csv": (write_csv, True),
+    "parquet": (write_parquet, False),
+    "arrow": (write_arrow, False),
+}
+
+
+def serialize(fmt: str, results, chunk_rows=None) -> bytes:
+    """Serialisasi hasil ke format `fmt`, ditulis per chunk ke satu buffer."""
+    chunk_rows = chunk_rows or config.EXPORT_CHUNK_ROWS
+    write, is_text = _WRITERS[fmt]
+    sink = io.BytesIO()
+    if is_text:
+        stream = io.TextIOWrapper(sink, encoding="utf-8", newline="")
+        write(results, stream, chunk_rows)
+        stream.flush()
+        stream.detach()
+    else:
+        write(results, sink, chunk_rows)
+    return sink.getvalue()
+
+
+def content_hash(results) -> str:
+    """Hash isi hasil pencarian, dipakai sebagai key memo artefak export."""
+    digest = hashlib.sha256()
+    for chunk in _chunks(results, config.EXPORT_CHUNK_ROWS):
+        digest.update(json.dumps(chunk, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# (hash, format) -> bytes, dibatasi total ukuran (LRU)
+_artifacts = OrderedDict()
+_artifacts_size = 0
+_artifacts_lock = threading.Lock()
+
+
+def get_artifact(fmt: str, results, digest: str) -> bytes:
+    """
+    File export untuk hasil dengan hash `digest`. Dibuat hanya saat diminta
+    (dipanggil oleh tombol download) lalu di-memo agar tidak dibuat ulang.
+    """
+    global _artifacts_size
+    key = (digest, fmt)
+    with _artifacts_lock:
+        payload = _artifacts.get(key)
+        if payload is not None:
+            _artifacts.move_to_end(key)
+    metrics.record_cache("export", payload is not None)
+    if payload is not None:
+        return payload
+
+    with metrics.span("export_serialize", format=fmt):
+        payload = serialize(fmt, results)
+
+    with _artifacts_lock:
+        if key not in _artifacts and len(payload) <= config.EXPORT_CACHE_MAX_BYTES:
+            _artifacts[key] = payload
+            _artifacts_size += len(payload)
+            while _artifacts_size > config.EXPORT_CACHE_MAX_BYTES:
+                _, evicted = _artifacts.popitem(last=False)
+                _artifacts_size -= len(evicted)
+    return payload
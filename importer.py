@@ -0,0 +1,280 @@
+"""
+Import data film dari file JSON/CSV/Parquet/Arrow secara streaming.
+
+File dibaca per potongan (chunk), baris dinormalisasi per batch dan langsung
+disimpan ke tabel kolumnar bertipe (`catalog.to_table`), sehingga memori
+puncak sebanding dengan ukuran chunk, bukan ukuran file. JSON array di-parse
+satu objek demi satu objek dengan `json.JSONDecoder.raw_decode`, tanpa
+memuat seluruh file ke memori; Parquet dan Arrow IPC dibaca per record batch.
+"""
+import csv
+import io
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import catalog
+import config
+import metrics
+
+_decoder = json.JSONDecoder()
+# Karakter yang bisa menjadi lanjutan angka JSON
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+# Ekstensi file yang diterima untuk setiap format
+FORMAT_EXTENSIONS = {
+    "json": ("json",),
+    "csv": ("csv",),
+    "parquet": ("parquet", "pq"),
+    "arrow": ("arrow", "feather", "ipc"),
+}
+
+# Nama kolom alternatif (mis. dari file berbahasa Indonesia), urut prioritas
+COLUMN_ALIASES = {
+    "title": ("title", "judul"),
+    "year": ("year", "tahun"),
+    "runtime": ("runtime", "durasi"),
+    "jwRating": ("jwRating",),
+    "tomatometer": ("tomatometer",),
+    "overview": ("overview", "deskripsi"),
+    "poster": ("poster_url", "poster"),
+    "link": ("link", "url"),
+}
+
+
+def accepted_extensions():
+    """Semua ekstensi untuk st.file_uploader."""
+    return [ext for exts in FORMAT_EXTENSIONS.values() for ext in exts]
+
+
+def detect_format(uploaded_file):
+    """'json' / 'csv' / 'parquet' / 'arrow' berdasarkan ekstensi, fallback ke MIME type."""
+    name = (getattr(uploaded_file, "name", "") or "").lower()
+    for fmt, exts in FORMAT_EXTENSIONS.items():
+        if any(name.endswith(f".{ext}") for ext in exts):
+            return fmt
+    mime = getattr(uploaded_file, "type", "") or ""
+    if mime == "application/json":
+        return "json"
+    if mime == "text/csv":
+        return "csv"
+    return None
+
+
+def normalize_row(row):
+    """Normalisasi keys untuk konsistensi dengan hasil pencarian"""
+    return {
+        "title": row.get("title", row.get("judul")),
+        "year": row.get("year", row.get("tahun")),
+        "runtime": row.get("runtime", row.get("durasi")),
+        "jwRating": row.get("jwRating"),
+        "tomatometer": row.get("tomatometer"),
+        "overview": row.get("overview") or row.get("deskripsi"),
+        "poster": row.get("poster_url") or row.get("poster"),
+        "link": row.get("link") or row.get("url"),
+    }
+
+
+def iter_json_records(text_stream, chunk_chars=None):
+    """
+    Menghasilkan objek satu per satu dari JSON array di `text_stream`.
+    Jika isi file bukan array (mis. satu objek), objek tersebut dikembalikan apa adanya.
+    JSON yang tidak valid (koma ganda/di awal/di akhir, elemen tanpa koma, data
+    tambahan setelah nilai utama) menghasilkan ValueError.
+    """
+    chunk_chars = chunk_chars or config.IMPORT_CHUNK_CHARS
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        data = text_stream.read(chunk_chars)
+        if not data:
+            eof = True
+        # Buang bagian yang sudah di-parse agar buffer tetap kecil
+        buffer = buffer[pos:] + data
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            fill()
+
+    def next_char():
+        """Karakter bukan spasi berikutnya (tidak dikonsumsi); error jika file sudah habis."""
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise ValueError("JSON array tidak lengkap")
+        return buffer[pos]
+
+    def decode_value():
+        nonlocal pos
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+                # Angka di ujung buffer bisa saja masih terpotong (mis. "-1.5e|10")
+                truncated = end == len(buffer) or (
+                    isinstance(value, (int, float)) and buffer[end] in _NUMBER_CHARS
+                )
+                if eof or not truncated:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    def expect_end():
+        skip_whitespace()
+        if pos < len(buffer):
+            raise ValueError(f"JSON tidak valid: ada data tambahan setelah nilai utama ({buffer[pos:pos + 20]!r})")
+
+    fill()
+    skip_whitespace()
+    if pos >= len(buffer):
+        return
+    if buffer[pos] != "[":
+        value = decode_value()
+        expect_end()
+        if isinstance(value, list):
+            yield from value
+        else:
+            yield value
+        return
+
+    pos += 1
+    if next_char() == "]":
+        pos += 1
+    else:
+        while True:
+            if next_char() in ",]":
+                raise ValueError(f"JSON tidak valid: elemen array kosong ({buffer[pos:pos + 20]!r})")
+            yield decode_value()
+            char = next_char()
+            pos += 1
+            if char == "]":
+                break
+            if char != ",":
+                raise ValueError(f"JSON tidak valid: diharapkan ',' atau ']' ({buffer[pos - 1:pos + 19]!r})")
+    expect_end()
+
+
+def iter_csv_records(text_stream):
+    """Menghasilkan baris CSV sebagai dict (dibaca baris demi baris)."""
+    yield from csv.DictReader(text_stream)
+
+
+def _normalize_frame(frame):
+    """Versi kolumnar dari normalize_row untuk satu record batch Parquet/Arrow."""
+    normalized = pd.DataFrame(index=frame.index)
+    for target, aliases in COLUMN_ALIASES.items():
+        column = None
+        for alias in aliases:
+            if alias in frame.columns:
+                column = frame[alias] if column is None else column.combine_first(frame[alias])
+        normalized[target] = column
+    return catalog.to_table(normalized)
+
+
+def _iter_arrow_batches(uploaded_file, fmt, chunk_rows):
+    """Menghasilkan (record_batch, fraction) dari file Parquet atau Arrow IPC."""
+    if fmt == "parquet":
+        parquet_file = pq.ParquetFile(uploaded_file)
+        total_rows = parquet_file.metadata.num_rows or 1
+        done = 0
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+            done += batch.num_rows
+            yield batch, min(done / total_rows, 1.0)
+        return
+
+    try:
+        reader = pa.ipc.open_file(uploaded_file)
+    except pa.ArrowInvalid:
+        # Bukan format file IPC, coba format stream
+        uploaded_file.seek(0)
+        for batch in pa.ipc.open_stream(uploaded_file):
+            yield batch, 1.0
+        return
+    total = reader.num_record_batches or 1
+    for idx in range(reader.num_record_batches):
+        yield reader.get_batch(idx), (idx + 1) / total
+
+
+def _import_columnar(uploaded_file, fmt, progress_callback, chunk_rows):
+    frames = []
+    row_count = 0
+    for batch, fraction in _iter_arrow_batches(uploaded_file, fmt, chunk_rows):
+        frames.append(_normalize_frame(batch.to_pandas()))
+        row_count += batch.num_rows
+        if progress_callback:
+            progress_callback(fraction, row_count)
+
+    if not frames:
+        return catalog.to_table([])
+    return pd.concat(frames, ignore_index=True)
+
+
+@metrics.timed("import_file")
+def import_file(uploaded_file, fmt, progress_callback=None, chunk_rows=None):
+    """
+    Membaca file upload secara streaming dan mengembalikan tabel bertipe (lihat catalog.to_table).
+    `progress_callback(fraction, row_count)` dipanggil setiap satu chunk selesai.
+    """
+    chunk_rows = chunk_rows or config.IMPORT_CHUNK_ROWS
+    uploaded_file.seek(0)
+    if fmt in ("parquet", "arrow"):
+        return _import_columnar(uploaded_file, fmt, progress_callback, chunk_rows)
+
+    total_bytes = getattr(uploaded_file, "size", 0) or 0
+    text_stream = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+
+    records = iter_json_records(text_stream) if fmt == "json" else iter_csv_records(text_stream)
+
+    frames = []
+    batch = []
+    row_count = 0
+
+    def flush():
+        nonlocal batch, row_count
+        if batch:
+            frames.append(catalog.to_table(batch))
+            row_count += len(batch)
+            batch = []
+        if progress_callback:
+            fraction = min(uploaded_file.tell() / total_bytes, 1.0) if total_bytes else 1.0
+            progress_callback(fraction, row_count)
+
+    try:
+        for record in records:
+            if isinstance(record, dict):
+                batch.append(normalize_row(record))
+            if len(batch) >= chunk_rows:
+                flush()
+        flush()
+    finally:
+        # Lepaskan wrapper tanpa menutup file upload milik Streamlit
+        text_stream.detach()
+
+    if not frames:
+        return catalog.to_table([])
+    return pd.concat(frames, ignore_index=True)
+
+
+def iter_records(imported_data, chunk_rows=None):
+    """Baris data import sebagai dict (per chunk, nilai kosong menjadi None)."""
+    if isinstance(imported_data, list):
+        yield from imported_data
+        return
+    chunk_rows = chunk_rows or config.IMPORT_CHUNK_ROWS
+    for start in range(0, len(imported_data), chunk_rows):
+        chunk = imported_data.iloc[start:start + chunk_rows]
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.to_dict("records")
@@ -0,0 +1,236 @@
+"""
+Metrik performa per proses: durasi span dan counter (mis. cache hit/miss).
+
+Span mengukur waktu satu operasi (panggilan JustWatch, Gemini, parsing import,
+pembuatan file export, render halaman, dll.) dan dipakai sebagai context
+manager (`with metrics.span("nama"):`) atau decorator (`@metrics.timed("nama")`).
+Aman dipanggil dari thread mana pun, termasuk worker background.
+
+Ringkasan metrik bisa dilihat di panel debug sidebar dan ditulis berkala ke
+file (format teks Prometheus untuk textfile collector, atau JSON lines).
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+
+# Batas bucket histogram durasi span (detik), untuk output Prometheus
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_lock = threading.Lock()
+_spans = {}      # (nama, labels) -> _SpanStats
+_counters = {}   # (nama, labels) -> int
+_last_flush = 0.0
+
+
+class _SpanStats:
+    __slots__ = ("count", "total", "max", "last", "errors", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.errors = 0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds: float, error: bool):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        if error:
+            self.errors += 1
+        for idx, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[idx] += 1
+                break
+
+
+def _labels_key(labels) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def observe(name: str, seconds: float, error: bool = False, **labels):
+    """Mencatat satu durasi untuk span `name`."""
+    key = (name, _labels_key(labels))
+    with _lock:
+        stats = _spans.get(key)
+        if stats is None:
+            stats = _spans[key] = _SpanStats()
+        stats.observe(seconds, error)
+
+
+@contextmanager
+def span(name: str, **labels):
+    """
+    Mengukur durasi blok `with`; exception tetap diteruskan dan dihitung sebagai error
+    (kecuali kontrol alur Streamlit seperti st.rerun yang bukan turunan Exception).
+    """
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        observe(name, time.perf_counter() - start, error, **labels)
+
+
+def timed(name: str, **labels):
+    """Decorator: setiap panggilan fungsi dicatat sebagai span `name`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, amount: int = 1, **labels):
+    """Menambah counter `name`."""
+    key = (name, _labels_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def record_cache(cache: str, hit: bool):
+    """Menambah counter cache_requests{cache, result=hit|miss}."""
+    count("cache_requests", cache=cache, result="hit" if hit else "miss")
+
+
+def snapshot():
+    """Salinan semua metrik: {"spans": [...], "counters": [...]} (durasi dalam milidetik)."""
+    with _lock:
+        spans = [
+            {
+                "name": name,
+                "labels": dict(labels),
+                "count": stats.count,
+                "errors": stats.errors,
+                "total_ms": round(stats.total * 1000, 3),
+                "avg_ms": round(stats.total * 1000 / stats.count, 3) if stats.count else 0.0,
+                "max_ms": round(stats.max * 1000, 3),
+                "last_ms": round(stats.last * 1000, 3),
+                "buckets": list(stats.buckets),
+            }
+            for (name, labels), stats in _spans.items()
+        ]
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in _counters.items()
+        ]
+    return {"spans": spans, "counters": counters}
+
+
+def cache_summary(data=None):
+    """{cache: {"hit": n, "miss": n, "hit_rate": 0-1}} dari counter cache_requests."""
+    data = data or snapshot()
+    summary = {}
+    for counter in data["counters"]:
+        if counter["name"] != "cache_requests":
+            continue
+        entry = summary.setdefault(counter["labels"].get("cache"), {"hit": 0, "miss": 0})
+        entry[counter["labels"].get("result")] = counter["value"]
+    for entry in summary.values():
+        total = entry["hit"] + entry["miss"]
+        entry["hit_rate"] = entry["hit"] / total if total else 0.0
+    return summary
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+# =================OUTPUT=================
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prometheus_labels(labels, **extra) -> str:
+    items = {**labels, **extra}
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items.items()) + "}"
+
+
+def to_prometheus(data=None) -> str:
+    """Metrik dalam format teks eksposisi Prometheus."""
+    data = data or snapshot()
+    lines = [
+        "# HELP film_span_seconds Durasi operasi aplikasi (detik).",
+        "# TYPE film_span_seconds histogram",
+    ]
+    for item in data["spans"]:
+        labels = {"span": item["name"], **item["labels"]}
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS, item["buckets"]):
+            cumulative += bucket
+            lines.append(f"film_span_seconds_bucket{_prometheus_labels(labels, le=bound)} {cumulative}")
+        lines.append(f"film_span_seconds_bucket{_prometheus_labels(labels, le='+Inf')} {item['count']}")
+        lines.append(f"film_span_seconds_sum{_prometheus_labels(labels)} {item['total_ms'] / 1000}")
+        lines.append(f"film_span_seconds_count{_prometheus_labels(labels)} {item['count']}")
+
+    lines += ["# HELP film_span_errors_total Operasi yang berakhir dengan exception.", "# TYPE film_span_errors_total counter"]
+    for item in data["spans"]:
+        labels = {"span": item["name"], **item["labels"]}
+        lines.append(f"film_span_errors_total{_prometheus_labels(labels)} {item['errors']}")
+
+    names = sorted({counter["name"] for counter in data["counters"]})
+    for name in names:
+        lines += [f"# TYPE film_{name}_total counter"]
+        for counter in data["counters"]:
+            if counter["name"] == name:
+                lines.append(f"film_{name}_total{_prometheus_labels(counter['labels'])} {counter['value']}")
+    return "\n".join(lines) + "\n"
+
+
+def to_json_line(data=None) -> str:
+    """Satu baris JSON berisi snapshot metrik beserta timestamp."""
+    data = data or snapshot()
+    return json.dumps({"timestamp": time.time(), "pid": os.getpid(), **data}, separators=(",", ":"))
+
+
+def flush(path=None, fmt=None):
+    """
+    Menulis metrik ke file. Prometheus: file ditimpa secara atomik (cocok untuk
+    textfile collector). JSON lines: satu snapshot ditambahkan per flush.
+    """
+    path = path or config.METRICS_FILE
+    fmt = fmt or config.METRICS_FORMAT
+    if not path:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if fmt == "jsonl":
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(to_json_line() + "\n")
+        return
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(to_prometheus())
+    os.replace(tmp_path, path)
+
+
+def maybe_flush():
+    """Flush jika METRICS_FILE diatur dan interval sudah lewat (dipanggil di akhir setiap run)."""
+    global _last_flush
+    if not config.METRICS_FILE:
+        return
+    now = time.monotonic()
+    with _lock:
+        if now - _last_flush < config.METRICS_FLUSH_INTERVAL:
+            return
+        _last_flush = now
+    try:
+        flush()
+    except OSError:
+        pass
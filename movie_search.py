@@ -0,0 +1,155 @@
+"""
+Pencarian film ke API JustWatch beserta normalisasi hasilnya.
+
+Hasil yang sudah dinormalisasi disimpan di cache persisten (SQLite) sehingga
+bisa dipakai ulang oleh semua worker process dan tetap ada setelah restart.
+Hasil yang sudah melewati SEARCH_CACHE_TTL (basi) tetap langsung dikembalikan
+sementara versi barunya diambil di background (stale-while-revalidate); hanya
+hasil yang melewati SEARCH_CACHE_HARD_TTL yang membuat user menunggu API.
+"""
+import logging
+import threading
+import time
+
+import api_client
+import background
+import config
+import disk_cache
+import metrics
+from utils import normalize_title
+
+logger = logging.getLogger(__name__)
+
+# Naikkan versi ini jika format hasil normalisasi berubah
+_CACHE_VERSION = "v1"
+
+# Key cache yang sedang diperbarui di background
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _search_cache():
+    # Entri disimpan sampai hard TTL; kapan entri dianggap basi ditentukan fetch_movies
+    return disk_cache.get_cache(
+        "search",
+        default_ttl=config.SEARCH_CACHE_HARD_TTL,
+        max_bytes=config.SEARCH_CACHE_MAX_BYTES,
+    )
+
+
+def normalize_results(data):
+    """Mengubah respons mentah API menjadi list film dengan key yang seragam."""
+    # Parsing data API yang kadang formatnya beda-beda
+    results = []
+    if isinstance(data, list): results = data
+    elif isinstance(data, dict):
+        if "description" in data and isinstance(data["description"], list): results = data["description"]
+        elif "data" in data: results = data["data"]
+        else: results = [data] # Fallback
+
+    # Normalisasi Data
+    normalized = []
+    for item in results:
+        if not isinstance(item, dict): continue
+        # Ambil poster dari berbagai kemungkinan key
+        poster = item.get("poster") or item.get("poster_url") or item.get("photo_url")
+        if isinstance(poster, list) and poster: poster = poster[0]
+        if not poster: poster = ""
+
+        item_offers = item.get("offers")
+        if not isinstance(item_offers, list): item_offers = []
+
+        normalized.append({
+            "title": item.get("title", "No Title"),
+            "year": item.get("year", ""),
+            "runtime": item.get("runtime", ""),
+            "jwRating": item.get("jwRating", ""),
+            "tomatometer": item.get("tomatometer", ""),
+            "poster": poster,
+            "overview": item.get("overview") or item.get("short_description") or "",
+            "link": item.get("url", ""),
+            "offers": item_offers,
+        })
+    return normalized
+
+
+def _check_response(data):
+    """ValueError jika respons API bukan hasil pencarian (mis. {"ok": false} dari API yang sedang error)."""
+    if isinstance(data, list):
+        return
+    if not isinstance(data, dict) or data.get("ok") is False:
+        raise ValueError(f"Respons API JustWatch tidak valid: {str(data)[:200]}")
+    if "description" not in data and "data" not in data:
+        raise ValueError(f"Respons API JustWatch tanpa hasil pencarian: {str(data)[:200]}")
+
+
+def _fetch(query: str, timeout):
+    """Request ke API lalu normalisasi; respons error menjadi exception dan tidak disimpan."""
+    # Lewat klien bersama agar koneksi (keep-alive) dipakai ulang
+    data = api_client.justwatch_search(query, timeout=timeout)
+    # Respons error tidak boleh sampai ke cache (bisa tersimpan sampai hard TTL)
+    _check_response(data)
+    return normalize_results(data)
+
+
+def _request(query: str, cache_key: str, timeout):
+    """Request ke API, normalisasi, lalu simpan ke cache (exception diteruskan ke pemanggil)."""
+    normalized = _fetch(query, timeout)
+    _search_cache().set(cache_key, normalized)
+    return normalized
+
+
+def _refresh(query: str, cache_key: str, timeout):
+    try:
+        with metrics.span("search_refresh"):
+            normalized = _fetch(query, timeout)
+        if not normalized:
+            # Hasil kosong dari API yang sedang bermasalah tidak boleh menimpa hasil lama
+            metrics.count("search_refresh", result="empty")
+            return
+        _search_cache().set(cache_key, normalized)
+        metrics.count("search_refresh", result="ok")
+    except Exception as e:
+        # Hasil lama tetap dipakai sampai hard TTL; kegagalan hanya dilaporkan
+        metrics.count("search_refresh", result="error")
+        logger.warning("Gagal memperbarui hasil pencarian '%s' (hasil lama tetap dipakai): %s", query, e)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(cache_key)
+
+
+def _start_refresh(query: str, cache_key: str, timeout):
+    """Memperbarui hasil basi di background (sekali per key meski diminta berkali-kali)."""
+    with _refreshing_lock:
+        if cache_key in _refreshing:
+            return
+        _refreshing.add(cache_key)
+    executor = background.get_executor("search_refresh", config.SEARCH_REFRESH_WORKERS)
+    executor.submit(_refresh, query, cache_key, timeout)
+
+
+@metrics.timed("fetch_movies")
+def fetch_movies(query: str, timeout=8):
+    """Ambil data film dari API (lewat cache persisten, hasil basi diperbarui di background)"""
+    if not query: return []
+    cache_key = f"{_CACHE_VERSION}:{normalize_title(query)}"
+
+    entry = _search_cache().get_entry(cache_key)
+    metrics.record_cache("search", entry is not None)
+    if entry is not None:
+        cached, created_at = entry
+        if time.time() - created_at >= config.SEARCH_CACHE_TTL:
+            metrics.count("search_stale_served")
+            _start_refresh(query, cache_key, timeout)
+        return cached
+
+    try:
+        return _request(query, cache_key, timeout)
+    except Exception as e:
+        # Error tidak di-cache supaya request berikutnya mencoba lagi
+        return {"_error": str(e)}
+
+
+def cached_results():
+    """Semua hasil pencarian yang masih ada di cache (dipakai untuk index saran judul)."""
+    yield from _search_cache().iter_values(f"{_CACHE_VERSION}:")
@@ -0,0 +1,102 @@
+"""
+Data streaming offers (tempat menonton) dari JustWatch.
+
+Respons /justwatch?q= yang diterima saat pencarian sudah membawa `offers`
+untuk setiap film. Offer tersebut disimpan di cache proses dengan key judul
+dan URL film, sehingga halaman detail tidak perlu request ulang untuk film
+yang berasal dari hasil pencarian.
+"""
+import threading
+from collections import OrderedDict
+
+import api_client
+import config
+import metrics
+from utils import normalize_title
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _keys_for(title=None, link=None):
+    keys = []
+    if link:
+        keys.append(("url", link))
+    if title:
+        keys.append(("title", normalize_title(title)))
+    return keys
+
+
+def _store(keys, offers):
+    with _cache_lock:
+        for key in keys:
+            _cache[key] = offers
+            _cache.move_to_end(key)
+        while len(_cache) > config.OFFER_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def remember_offers(movies):
+    """Menyimpan offers dari daftar film hasil normalisasi ke cache."""
+    if not isinstance(movies, list):
+        return
+    for movie in movies:
+        offers = movie.get("offers")
+        if isinstance(offers, list):
+            _store(_keys_for(movie.get("title"), movie.get("link")), offers)
+
+
+def get_cached_offers(title=None, link=None):
+    """Mengambil offers dari cache (URL lebih spesifik, dicek dulu). None jika tidak ada."""
+    with _cache_lock:
+        for key in _keys_for(title, link):
+            if key in _cache:
+                _cache.move_to_end(key)
+                return _cache[key]
+    return None
+
+
+@metrics.timed("get_streaming_links_from_imdb")
+def get_streaming_links_from_imdb(judul, timeout=10):
+    """
+    Request ke API JustWatch untuk mengambil offers film pertama yang paling relevan.
+    None jika request gagal (mis. timeout atau circuit JustWatch sedang terbuka)
+    atau API membalas error (`{"ok": false}`), supaya tidak tersimpan di cache.
+    """
+    try:
+        resp = api_client.justwatch_search(judul, timeout=timeout)
+        if not isinstance(resp, dict) or not resp.get("ok"):
+            return None
+
+        des = resp.get("description", [])
+        if len(des) == 0:
+            return []
+
+        # ambil film pertama yang paling relevan
+        return des[0].get("offers", [])
+
+    except Exception:
+        return None
+
+
+def get_movie_offers(movie):
+    """
+    Offers untuk film di halaman detail, urutan sumber:
+    data film itu sendiri -> cache -> request ke API (hasilnya di-cache).
+    None jika API sedang gagal; kegagalan tidak di-cache supaya bisa dicoba lagi.
+    """
+    offers = movie.get("offers")
+    if isinstance(offers, list):
+        return offers
+
+    title = movie.get("title") or movie.get("originalTitle") or ""
+    link = movie.get("link")
+    cached = get_cached_offers(title, link)
+    metrics.record_cache("offers", cached is not None)
+    if cached is not None:
+        return cached
+
+    offers = get_streaming_links_from_imdb(title)
+    if offers is not None:
+        _store(_keys_for(title, link), offers)
+    return offers
@@ -0,0 +1,174 @@
+"""
+Layanan poster: unduh sekali, perkecil, simpan di cache disk lokal.
+
+Poster dari hasil pencarian, data import dan `image_url` Gemini sebelumnya
+diberikan langsung ke `st.image(url)` dalam resolusi penuh, sehingga browser
+mengunduhnya dari host luar di setiap render. Di sini setiap URL diunduh
+satu kali, diperkecil ke ukuran thumbnail grid dan detail (JPEG), lalu
+disimpan di cache SQLite dengan batas ukuran (LRU). Halaman menerima bytes
+lokal; URL kosong atau gagal diunduh diganti placeholder bawaan aplikasi.
+"""
+import hashlib
+import io
+import logging
+import os
+import threading
+from concurrent.futures import wait
+from functools import lru_cache
+
+from PIL import Image
+
+import api_client
+import background
+import config
+import disk_cache
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Ukuran maksimum (lebar, tinggi) thumbnail; rasio asli poster dipertahankan
+SIZES = {
+    "grid": (300, 450),
+    "detail": (400, 600),
+}
+
+PLACEHOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "poster_placeholder.png")
+
+# Naikkan versi jika ukuran/format thumbnail berubah
+_CACHE_VERSION = "v1"
+
+# URL -> Future unduhan yang sedang berjalan, supaya satu URL tidak diunduh dua kali
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _poster_cache():
+    return disk_cache.get_cache(
+        "posters",
+        default_ttl=config.POSTER_CACHE_TTL,
+        max_bytes=config.POSTER_CACHE_MAX_BYTES,
+    )
+
+
+def _cache_key(url: str, size: str) -> str:
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return f"{_CACHE_VERSION}:{size}:{digest}"
+
+
+def _is_remote(url) -> bool:
+    return isinstance(url, str) and url.startswith(("http://", "https://"))
+
+
+def _thumbnail(image: Image.Image, size: str) -> bytes:
+    thumb = image.copy()
+    thumb.thumbnail(SIZES[size], Image.Resampling.LANCZOS)
+    out = io.BytesIO()
+    thumb.save(out, "JPEG", quality=config.POSTER_JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+@lru_cache(maxsize=None)
+def placeholder(size: str = "grid") -> bytes:
+    """Placeholder lokal (assets/poster_placeholder.png) dalam ukuran `size`."""
+    with Image.open(PLACEHOLDER_PATH) as image:
+        return _thumbnail(image.convert("RGB"), size)
+
+
+@metrics.timed("poster_download")
+def _download(url: str):
+    """Unduh satu poster lalu simpan semua ukuran thumbnail. Mengembalikan {size: bytes} atau None."""
+    cache = _poster_cache()
+    try:
+        data = api_client.get_bytes(
+            url,
+            config.POSTER_MAX_SOURCE_BYTES,
+            timeout=config.POSTER_FETCH_TIMEOUT,
+            allow_private=config.POSTER_ALLOW_PRIVATE_HOSTS,
+            max_redirects=config.POSTER_MAX_REDIRECTS,
+        )
+        with Image.open(io.BytesIO(data)) as image:
+            # Decoder JPEG bisa langsung men-decode di resolusi yang lebih kecil
+            image.draft("RGB", SIZES["detail"])
+            image = image.convert("RGB")
+            thumbnails = {size: _thumbnail(image, size) for size in SIZES}
+    except Exception as e:
+        logger.info("Poster %s gagal diunduh: %s", url, e)
+        # Tandai gagal (bytes kosong) agar tidak dicoba lagi di setiap rerun
+        for size in SIZES:
+            cache.set_bytes(_cache_key(url, size), b"", ttl=config.POSTER_FAILURE_TTL)
+        return None
+
+    for size, payload in thumbnails.items():
+        cache.set_bytes(_cache_key(url, size), payload)
+    return thumbnails
+
+
+def _finish_download(url: str):
+    try:
+        return _download(url)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(url, None)
+
+
+def _submit(url: str):
+    """Future unduhan untuk `url` (dipakai bersama jika sudah ada yang berjalan)."""
+    executor = background.get_executor("posters", config.POSTER_FETCH_WORKERS)
+    with _inflight_lock:
+        future = _inflight.get(url)
+        if future is None:
+            # Lock masih dipegang, jadi _finish_download baru bisa menghapus setelah terdaftar
+            future = executor.submit(_finish_download, url)
+            _inflight[url] = future
+        return future
+
+
+def _cached(url: str, size: str):
+    """bytes thumbnail, b"" jika URL ini tercatat gagal, atau None jika belum ada di cache."""
+    return _poster_cache().get_bytes(_cache_key(url, size))
+
+
+def get_posters(urls, size: str = "grid"):
+    """
+    Thumbnail JPEG (bytes) untuk setiap URL, urutan sama dengan `urls`.
+    Poster yang belum di-cache diunduh paralel dengan satu batas waktu untuk semuanya;
+    yang kosong, gagal atau belum selesai diganti placeholder.
+    """
+    results = [None] * len(urls)
+    pending = {}
+    for idx, url in enumerate(urls):
+        if not _is_remote(url):
+            continue
+        cached = _cached(url, size)
+        metrics.record_cache("posters", cached is not None)
+        if cached is None:
+            pending.setdefault(url, []).append(idx)
+        else:
+            results[idx] = cached
+
+    futures = {url: _submit(url) for url in pending}
+    # Satu batas waktu untuk semua poster: yang belum selesai diganti placeholder
+    # (unduhan tetap berjalan di background dan dipakai di rerun berikutnya)
+    if futures:
+        wait(futures.values(), timeout=config.POSTER_FETCH_TIMEOUT + config.HTTP_CONNECT_TIMEOUT)
+    for url, future in futures.items():
+        try:
+            thumbnails = future.result(timeout=0) if future.done() else None
+        except Exception:
+            thumbnails = None
+        for idx in pending[url]:
+            results[idx] = thumbnails.get(size) if thumbnails else None
+
+    return [payload or placeholder(size) for payload in results]
+
+
+def get_poster(url, size: str = "grid") -> bytes:
+    """Thumbnail JPEG untuk satu URL poster (atau placeholder)."""
+    return get_posters([url], size)[0]
+
+
+def prefetch(urls):
+    """Mulai mengunduh poster yang belum di-cache di background (tanpa menunggu)."""
+    for url in dict.fromkeys(urls):
+        if _is_remote(url) and _cached(url, "grid") is None:
+            _submit(url)
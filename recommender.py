@@ -0,0 +1,216 @@
+"""
+Rekomendasi film lokal berdasarkan katalog sesi (hasil pencarian + import).
+
+Setiap film direpresentasikan sebagai vektor TF-IDF dari judul dan overview,
+ditambah fitur numerik tahun, durasi dan rating yang dinormalisasi (z-score).
+Term disimpan sebagai posting (film, term, tf) dalam array NumPy; film baru
+(mis. dari import) hanya ditokenisasi sekali saat ditambahkan, lalu index
+terbalik term -> film dan norma vektor dihitung ulang secara vektor.
+
+Satu query hanya menjumlahkan posting dari term milik film yang sedang
+dilihat, jadi top-k film mirip didapat dalam hitungan milidetik, lengkap
+dengan poster asli dari katalog. Jika film yang cukup mirip terlalu sedikit,
+`recommend` mengembalikan None dan pemanggil memakai Gemini sebagai fallback.
+"""
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import config
+
+# Kata minimal 3 huruf (tanpa angka), dalam huruf kecil
+_TOKEN_PATTERN = r"[^\W\d_]{3,}"
+
+# Kata umum (Inggris + Indonesia) yang tidak membedakan isi film
+STOPWORDS = frozenset("""
+the and for with that this from his her their they them who whom what when where which while into onto
+over after before about against between through during under again further then once here there all any
+both each few more most other some such only own same than too very can will just but not are was were
+been being have has had having does did doing its itself our ours you your yours him she hers it's out
+off one two new must also yet ever every upon
+yang dan untuk dengan dari pada dalam ini itu akan oleh para sebuah seorang adalah atau juga tidak bisa
+harus ketika saat setelah sebelum mereka kita kami dia nya tetapi namun karena agar antara hingga sampai
+telah sudah masih lebih serta bagi tentang bersama
+""".split())
+
+# Kolom fitur numerik: tahun, durasi, rating
+_FEATURE_COLUMNS = ["year", "runtime", "rating"]
+
+
+class LocalRecommender:
+    """Index TF-IDF + fitur numerik yang bertambah secara inkremental."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._synced_tables = ()       # bagian katalog pada sync terakhir
+        self._synced_known = []        # id film per baris, sejajar dengan _synced_tables
+        self._ids = {}                 # key katalog -> id film
+        self._vocab = {}               # term -> id term
+        self._df = np.zeros(0, dtype=np.int64)
+        self._postings = []            # list of (doc_ids, term_ids, tf) per batch tambahan
+        self._info = []                # list of DataFrame (title, year, rating, poster) per batch
+        self._features = []            # list of array (n, 3) per batch, NaN jika kosong
+        self._active = np.zeros(0, dtype=bool)
+        self._prepared = False
+
+    def __len__(self):
+        return len(self._ids)
+
+    # --- Pemeliharaan index ---
+
+    def sync(self, *tables):
+        """
+        Menyamakan index dengan tabel katalog (kolom `key` wajib ada, unik per tabel).
+        Katalog mengirim bagiannya per sumber; bagian yang sama (objek yang sama)
+        dengan sync sebelumnya tidak dicocokkan ulang. Hanya film dengan key baru
+        yang ditokenisasi; film yang tidak ada lagi di katalog dinonaktifkan
+        (tidak muncul sebagai rekomendasi).
+        """
+        with self._lock:
+            if len(tables) == len(self._synced_tables) and all(
+                    table is synced for table, synced in zip(tables, self._synced_tables)):
+                return
+            known_per_table = []
+            for position, table in enumerate(tables):
+                if position < len(self._synced_tables) and table is self._synced_tables[position]:
+                    known = self._synced_known[position]
+                else:
+                    known = np.fromiter((self._ids.get(key, -1) for key in table["key"]),
+                                        dtype=np.int64, count=len(table))
+                    is_new = known < 0
+                    if is_new.any():
+                        known[is_new] = np.arange(len(self._ids), len(self._ids) + int(is_new.sum()))
+                        self._add(table[is_new])
+                known_per_table.append(known)
+
+            active = np.zeros(len(self._ids), dtype=bool)
+            for known in known_per_table:
+                active[known] = True
+            self._active = active
+            self._synced_tables = tables
+            self._synced_known = known_per_table
+
+    def _add(self, rows):
+        start = len(self._ids)
+        rows = rows.reset_index(drop=True)
+        self._ids.update(zip(rows["key"], range(start, start + len(rows))))
+
+        # Judul dihitung dua kali agar lebih berbobot dibanding overview
+        title = rows["title"].astype(object).fillna("")
+        text = title + " " + title + " " + rows["overview"].astype(object).fillna("")
+        tokens = text.str.casefold().str.findall(_TOKEN_PATTERN).explode().dropna()
+        tokens = tokens[~tokens.isin(STOPWORDS)]
+        counts = pd.DataFrame({"doc": tokens.index.to_numpy(), "term": tokens.to_numpy()}).value_counts(sort=False)
+
+        terms = counts.index.get_level_values("term")
+        for term in pd.unique(terms):
+            if term not in self._vocab:
+                self._vocab[term] = len(self._vocab)
+        term_ids = pd.Series(terms).map(self._vocab).to_numpy(dtype=np.int64)
+        doc_ids = counts.index.get_level_values("doc").to_numpy(dtype=np.int64) + start
+        tf = (1.0 + np.log(counts.to_numpy(dtype=np.float64))).astype(np.float32)
+
+        df = np.zeros(len(self._vocab), dtype=np.int64)
+        df[:len(self._df)] = self._df
+        df += np.bincount(term_ids, minlength=len(self._vocab))
+        self._df = df
+        self._postings.append((doc_ids, term_ids, tf))
+
+        features = rows[_FEATURE_COLUMNS].astype("float64").to_numpy()
+        # Durasi/rating 0 berarti data kosong
+        features[:, 1:][features[:, 1:] <= 0] = np.nan
+        self._features.append(features)
+        self._info.append(rows[["title", "year", "rating", "poster"]])
+        self._prepared = False
+
+    def _prepare(self):
+        """Menghitung ulang bobot TF-IDF, norma, index terbalik dan fitur z-score (vektor)."""
+        if self._prepared:
+            return
+        n_docs = len(self._ids)
+        doc_ids = np.concatenate([p[0] for p in self._postings])
+        term_ids = np.concatenate([p[1] for p in self._postings])
+        tf = np.concatenate([p[2] for p in self._postings])
+
+        idf = (np.log((1 + n_docs) / (1 + self._df)) + 1).astype(np.float32)
+        weights = tf * idf[term_ids]
+        norms = np.sqrt(np.bincount(doc_ids, weights=weights * weights, minlength=n_docs))
+        norms[norms == 0] = 1.0
+        weights = (weights / norms[doc_ids]).astype(np.float32)
+
+        # Posting per film (untuk vektor query) dan per term (index terbalik)
+        by_doc = np.argsort(doc_ids, kind="stable")
+        self._doc_terms = term_ids[by_doc]
+        self._doc_weights = weights[by_doc]
+        self._doc_ptr = np.searchsorted(doc_ids[by_doc], np.arange(n_docs + 1))
+
+        by_term = np.argsort(term_ids, kind="stable")
+        self._term_docs = doc_ids[by_term]
+        self._term_weights = weights[by_term]
+        self._term_ptr = np.searchsorted(term_ids[by_term], np.arange(len(self._vocab) + 1))
+
+        features = np.concatenate(self._features)
+        with warnings.catch_warnings():
+            # Kolom yang seluruhnya kosong menghasilkan NaN (ditangani di bawah)
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(features, axis=0)
+            std = np.nanstd(features, axis=0)
+        mean = np.nan_to_num(mean)
+        std = np.where(np.nan_to_num(std) > 0, np.nan_to_num(std), 1.0)
+        # Nilai kosong dianggap rata-rata (z = 0)
+        self._zscores = np.nan_to_num((features - mean) / std)
+
+        self._info_table = pd.concat(self._info, ignore_index=True)
+        self._postings = [(doc_ids, term_ids, tf)]
+        self._features = [features]
+        self._info = [self._info_table]
+        self._prepared = True
+
+    # --- Query ---
+
+    def recommend(self, key: str, k=None):
+        """
+        Top-k film mirip (format sama dengan rekomendasi Gemini, plus `sumber`="lokal"),
+        atau None jika film tidak ada di index / film yang cukup mirip kurang dari k.
+        """
+        k = k or config.RECOMMENDER_TOP_K
+        with self._lock:
+            doc = self._ids.get(key)
+            if doc is None or len(self._ids) < config.RECOMMENDER_MIN_CATALOG:
+                return None
+            self._prepare()
+
+            text_scores = np.zeros(len(self._ids), dtype=np.float32)
+            start, end = self._doc_ptr[doc], self._doc_ptr[doc + 1]
+            for term, weight in zip(self._doc_terms[start:end], self._doc_weights[start:end]):
+                lo, hi = self._term_ptr[term], self._term_ptr[term + 1]
+                # Satu film muncul paling banyak sekali per term, jadi indexing biasa aman
+                text_scores[self._term_docs[lo:hi]] += weight * self._term_weights[lo:hi]
+
+            distance = np.sqrt(((self._zscores - self._zscores[doc]) ** 2).sum(axis=1))
+            numeric_scores = 1.0 / (1.0 + distance)
+            text_weight = config.RECOMMENDER_TEXT_WEIGHT
+            scores = text_weight * text_scores + (1 - text_weight) * numeric_scores
+
+            eligible = self._active & (text_scores >= config.RECOMMENDER_MIN_TEXT_SIMILARITY)
+            eligible[doc] = False
+            candidates = np.flatnonzero(eligible)
+            if len(candidates) < k:
+                return None
+            top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            rows = self._info_table.iloc[top]
+            recommendations = []
+            for (_, row), score in zip(rows.iterrows(), scores[top]):
+                recommendations.append({
+                    "judul_film": row["title"],
+                    "tahun": None if pd.isna(row["year"]) else int(row["year"]),
+                    "rating": None if pd.isna(row["rating"]) or row["rating"] <= 0 else round(float(row["rating"]), 1),
+                    "image_url": None if pd.isna(row["poster"]) else row["poster"],
+                    "skor": round(float(score), 3),
+                    "sumber": "lokal",
+                })
+            return recommendations
@@ -0,0 +1,258 @@
+"""
+Saran judul film lokal (prefix + trigram) untuk teks pencarian user.
+
+Semua judul yang pernah terlihat (hasil pencarian yang di-cache, daftar
+film populer, data import dan history pencarian) dimasukkan ke index di
+memori. Saran dihitung lokal tanpa request ke API: pertama judul yang
+diawali teks input (bisect pada list terurut), lalu kecocokan fuzzy
+berdasarkan trigram sehingga salah ketik kecil tetap menemukan judulnya.
+Kandidat fuzzy hanya diambil dari trigram query yang jarang dan dinilai
+dengan array NumPy, jadi trigram umum ("the") tidak ditelusuri per judul.
+Pencarian ke API baru dijalankan saat user mengirim form pencarian
+(Enter atau tombol cari) atau memilih salah satu saran.
+"""
+import bisect
+import re
+import threading
+
+import numpy as np
+
+import config
+import metrics
+import movie_search
+
+_NON_ALNUM = re.compile(r"[^\w]+")
+
+# Skor untuk judul yang diawali teks input (selalu di atas skor fuzzy)
+PREFIX_SCORE = 2.0
+
+
+def normalize_text(text) -> str:
+    """Huruf kecil, tanda baca menjadi spasi, spasi dirapikan."""
+    if not isinstance(text, str):
+        return ""
+    return " ".join(_NON_ALNUM.sub(" ", text.casefold()).split())
+
+
+def trigrams(normalized: str):
+    """Himpunan trigram dari teks ternormalisasi (diberi padding spasi di awal/akhir)."""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """Index judul untuk saran prefix dan fuzzy (thread-safe, hanya bertambah)."""
+
+    def __init__(self, titles=()):
+        self._lock = threading.Lock()
+        self._titles = []            # id -> judul asli (untuk ditampilkan)
+        self._normalized = []        # id -> judul ternormalisasi
+        self._gram_counts = []       # id -> jumlah trigram judul
+        self._ids = {}               # judul ternormalisasi -> id
+        self._sorted = []            # (judul ternormalisasi, id) terurut, untuk prefix
+        self._pending_sorted = []    # entri baru yang belum digabung ke _sorted
+        self._grams = {}             # trigram -> list id
+        self._gram_arrays = {}       # trigram -> salinan postings sebagai array NumPy (untuk skor fuzzy)
+        self._gram_counts_array = np.zeros(0, dtype=np.int32)
+        self.add(titles)
+
+    def __len__(self):
+        return len(self._titles)
+
+    def add(self, titles, chunk_size=5000):
+        """
+        Menambahkan judul baru; judul yang sudah ada (setelah normalisasi) dilewati.
+        Lock dilepas setiap `chunk_size` judul agar saran tetap bisa dihitung selama index diisi.
+        """
+        titles = list(titles)
+        for start in range(0, len(titles), chunk_size):
+            with self._lock:
+                self._add_chunk(titles[start:start + chunk_size])
+
+    def _add_chunk(self, titles):
+        grams_index = self._grams
+        for title in titles:
+            normalized = normalize_text(title)
+            if not normalized or normalized in self._ids:
+                continue
+            title_id = len(self._titles)
+            self._titles.append(" ".join(title.split()))
+            self._normalized.append(normalized)
+            self._ids[normalized] = title_id
+            self._pending_sorted.append((normalized, title_id))
+            grams = trigrams(normalized)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                postings = grams_index.get(gram)
+                if postings is None:
+                    grams_index[gram] = [title_id]
+                else:
+                    postings.append(title_id)
+
+    def _sorted_entries(self):
+        # Pengurutan ditunda sampai ada query, jadi menambah banyak judul tetap murah
+        if self._pending_sorted:
+            self._sorted = sorted(self._sorted + self._pending_sorted)
+            self._pending_sorted = []
+        return self._sorted
+
+    def _prefix_ids(self, normalized: str, limit: int):
+        entries = self._sorted_entries()
+        start = bisect.bisect_left(entries, (normalized, -1))
+        ids = []
+        for key, title_id in entries[start:start + limit]:
+            if not key.startswith(normalized):
+                break
+            ids.append(title_id)
+        return ids
+
+    def _postings_array(self, gram: str):
+        """Postings trigram sebagai array; bagian yang bertambah sejak query terakhir disambung."""
+        postings = self._grams.get(gram)
+        if not postings:
+            return None
+        array = self._gram_arrays.get(gram)
+        if array is None or len(array) < len(postings):
+            done = 0 if array is None else len(array)
+            tail = np.array(postings[done:], dtype=np.int32)
+            array = self._gram_arrays[gram] = tail if array is None else np.concatenate([array, tail])
+        return array
+
+    def _gram_counts_for_all(self):
+        counts = self._gram_counts_array
+        if len(counts) < len(self._gram_counts):
+            tail = np.array(self._gram_counts[len(counts):], dtype=np.int32)
+            counts = self._gram_counts_array = np.concatenate([counts, tail])
+        return counts
+
+    def _fuzzy_scores(self, normalized: str, limit: int, min_score: float):
+        query_grams = trigrams(normalized)
+        arrays = sorted(
+            (array for array in map(self._postings_array, query_grams) if array is not None),
+            key=len,
+        )
+        if not arrays:
+            return []
+
+        # Kandidat hanya dari trigram yang jarang (postings <= SUGGEST_MAX_POSTINGS, paling jarang dulu);
+        # trigram umum seperti "the" tidak ditelusuri, tapi tetap dihitung untuk skor kandidat
+        rare = [array for array in arrays if len(array) <= config.SUGGEST_MAX_POSTINGS] or arrays[:1]
+        common = arrays[len(rare):]
+        candidates, shared = np.unique(np.concatenate(rare), return_counts=True)
+        if len(candidates) > config.SUGGEST_MAX_CANDIDATES:
+            # Hanya kandidat dengan kemiripan trigram jarang tertinggi yang dinilai lengkap
+            partial = shared / (len(query_grams) + self._gram_counts_for_all()[candidates])
+            top = np.argpartition(-partial, config.SUGGEST_MAX_CANDIDATES)[:config.SUGGEST_MAX_CANDIDATES]
+            candidates, shared = candidates[top], shared[top]
+            order = np.argsort(candidates)
+            candidates, shared = candidates[order], shared[order]
+        for array in common:
+            # Postings terurut (id bertambah), jadi keanggotaan cukup dengan binary search
+            positions = np.minimum(np.searchsorted(array, candidates), len(array) - 1)
+            shared += array[positions] == candidates
+
+        # Kemiripan Dice terhadap trigram judul
+        scores = 2 * shared / (len(query_grams) + self._gram_counts_for_all()[candidates])
+
+        # Bonus jika query ada di dalam judul. Itu hanya mungkin jika judul memuat semua
+        # trigram bagian dalam query (tanpa padding); dari kandidat seperti itu hanya
+        # `limit` teratas yang perlu diperiksa, karena bonusnya sama untuk semua
+        eligible = np.flatnonzero(shared >= len(query_grams) - 3) if len(normalized) >= 3 else []
+        for i in range(len(normalized) - 2):
+            array = self._postings_array(normalized[i:i + 3])
+            if array is None or not len(eligible):
+                eligible = []
+                break
+            ids = candidates[eligible]
+            eligible = eligible[array[np.minimum(np.searchsorted(array, ids), len(array) - 1)] == ids]
+        found = 0
+        for pos in sorted(eligible, key=lambda pos: -scores[pos]):
+            if normalized in self._normalized[candidates[pos]]:
+                scores[pos] += 0.5
+                found += 1
+                if found >= limit:
+                    break
+
+        keep = scores >= min_score
+        candidates, scores = candidates[keep], scores[keep]
+        if len(scores) > limit:
+            # Ambil `limit` skor teratas beserta yang seri dengannya, urutan akhir ditentukan di bawah
+            threshold = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            top = scores >= threshold
+            candidates, scores = candidates[top], scores[top]
+
+        scored = [(float(score), int(title_id)) for score, title_id in zip(scores, candidates)]
+        scored.sort(key=lambda item: (-item[0], len(self._normalized[item[1]])))
+        return scored[:limit]
+
+    def matches(self, query: str, limit=None, min_score=None):
+        """
+        List (skor, judul) untuk `query`, skor tertinggi dulu. Judul yang diawali
+        query mendapat skor PREFIX_SCORE; sisanya diisi kecocokan fuzzy trigram.
+        """
+        limit = limit or config.SUGGEST_LIMIT
+        min_score = config.SUGGEST_MIN_SCORE if min_score is None else min_score
+        normalized = normalize_text(query)
+        if len(normalized) < config.SUGGEST_MIN_CHARS:
+            return []
+
+        with self._lock:
+            scored = [(PREFIX_SCORE, title_id) for title_id in self._prefix_ids(normalized, limit)]
+            if len(scored) < limit:
+                # Fuzzy hanya dihitung jika hasil prefix belum cukup
+                found = {title_id for _, title_id in scored}
+                for score, title_id in self._fuzzy_scores(normalized, limit, min_score):
+                    if title_id not in found:
+                        scored.append((score, title_id))
+                        if len(scored) >= limit:
+                            break
+            return [(score, self._titles[title_id]) for score, title_id in scored]
+
+    def suggest(self, query: str, limit=None):
+        """Judul yang cocok dengan `query` (lihat `matches`)."""
+        return [title for _, title in self.matches(query, limit=limit)]
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+
+def _result_titles(results):
+    if not isinstance(results, list):
+        return []
+    return [movie.get("title") for movie in results if isinstance(movie, dict)]
+
+
+def shared_index() -> TitleIndex:
+    """
+    Index bersama satu proses: judul film populer dan semua hasil pencarian.
+    Saat pertama dibuat, diisi dari hasil pencarian yang sudah ada di cache disk.
+    """
+    global _shared_index
+    if _shared_index is None:
+        with _shared_lock:
+            if _shared_index is None:
+                index = TitleIndex(config.POPULAR_QUERIES)
+                for results in movie_search.cached_results():
+                    index.add(_result_titles(results))
+                _shared_index = index
+    return _shared_index
+
+
+def add_results(results):
+    """Menambahkan judul dari satu hasil pencarian ke index bersama."""
+    shared_index().add(_result_titles(results))
+
+
+@metrics.timed("suggest")
+def suggest(query: str, *indexes, limit=None):
+    """Gabungan saran dari index bersama dan index lain (mis. index per sesi), urut skor."""
+    limit = limit or config.SUGGEST_LIMIT
+    best = {}
+    for index in (shared_index(), *indexes):
+        for score, title in index.matches(query, limit=limit):
+            key = normalize_text(title)
+            if key not in best or score > best[key][0]:
+                best[key] = (score, title)
+    ranked = sorted(best.values(), key=lambda item: (-item[0], len(item[1])))
+    return [title for _, title in ranked[:limit]]
@@ -0,0 +1,63 @@
+import io
+import json
+
+import pytest
+
+from importer import iter_json_records
+
+
+def parse(text, chunk_chars=4):
+    # Chunk kecil supaya token dan nilai juga terpotong di batas buffer
+    return list(iter_json_records(io.StringIO(text), chunk_chars=chunk_chars))
+
+
+@pytest.mark.parametrize("text", [
+    "[]",
+    " [ ] ",
+    "[1]",
+    "[1, 2, 3]",
+    '[{"title": "Avatar", "year": 2009}, {"title": "Up"}]\n',
+    '[\n  {"a": [1, 2]},\n  {"b": {"c": "x, y]"}}\n]',
+    "[12345678901234567890, -1.5e10]",
+])
+def test_valid_array(text):
+    assert parse(text) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 3, 1024])
+def test_chunk_size_does_not_change_result(chunk_chars):
+    text = json.dumps([{"title": f"Film {i}", "rating": i / 10} for i in range(50)])
+    assert parse(text, chunk_chars) == json.loads(text)
+
+
+def test_number_split_at_any_boundary():
+    text = "[-1.5e10, 12345, 0.25, 1E-3]"
+    for chunk_chars in range(1, len(text) + 1):
+        assert parse(text, chunk_chars) == json.loads(text)
+
+
+def test_single_object():
+    assert parse('  {"title": "Avatar"}  ') == [{"title": "Avatar"}]
+
+
+def test_empty_file():
+    assert parse("") == []
+    assert parse("  \n") == []
+
+
+@pytest.mark.parametrize("text", [
+    "[1 2]",
+    "[,,1]",
+    "[,1]",
+    "[1,]",
+    "[1,,2]",
+    "[1, 2",
+    "[",
+    '[{"a": 1}]garbage',
+    "[1] [2]",
+    '{"a": 1} {"b": 2}',
+    '{"a": 1},',
+])
+def test_invalid_json_is_rejected(text):
+    with pytest.raises(ValueError):
+        parse(text)
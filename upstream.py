@@ -0,0 +1,306 @@
+"""
+Pengaman panggilan ke layanan luar (JustWatch, Gemini) yang dipakai bersama
+semua sesi dalam satu proses.
+
+- Single-flight: panggilan identik (upstream + key sama) yang datang saat
+  panggilan pertama masih berjalan tidak membuat request baru, tetapi
+  menunggu dan memakai hasil (atau exception) panggilan pertama.
+- Token bucket per upstream: membatasi laju request. Request yang melebihi
+  laju mengantre (slot dipesan berurutan) paling lama `max_wait` detik;
+  jika antrean lebih panjang, ditolak dengan `RateLimited` supaya halaman
+  langsung menampilkan error alih-alih menunggu timeout.
+- Circuit breaker per upstream: jika rasio gagal di jendela panggilan
+  terakhir terlalu tinggi, panggilan berikutnya langsung gagal dengan
+  `CircuitOpen` selama beberapa detik, lalu satu panggilan percobaan
+  (half-open) menentukan apakah circuit ditutup lagi.
+- Retry terbatas dengan backoff eksponensial + jitter, dibatasi anggaran
+  retry (rasio dari jumlah panggilan) agar retry tidak melipatgandakan beban
+  saat upstream bermasalah. Hanya gangguan sementara (koneksi gagal, 5xx,
+  429, timeout) yang dihitung circuit breaker dan di-retry; error permanen
+  seperti 4xx atau API key salah langsung diteruskan. Timeout tidak di-retry,
+  dan kegagalan yang baru muncul setelah RETRY_MAX_ELAPSED detik juga tidak,
+  supaya host yang menggantung tidak membuat user menunggu beberapa kali
+  lipat batas waktunya.
+
+Jumlah panggilan yang dibagi, waktu antre, penolakan, retry dan perubahan
+status circuit dicatat di metrics.
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import config
+import metrics
+
+
+class RateLimited(Exception):
+    """Antrean rate limit upstream terlalu panjang."""
+
+
+class CircuitOpen(Exception):
+    """Upstream sedang dianggap bermasalah; panggilan tidak dikirim."""
+
+
+class TokenBucket:
+    """Token bucket dengan reservasi: setiap pemanggil memesan slot berikutnya (FIFO)."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float):
+        """Memesan satu token; mengembalikan lama harus menunggu (detik) atau None jika melebihi `max_wait`."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Token boleh negatif: itu berarti slot sudah dipesan pemanggil sebelumnya
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+class CircuitBreaker:
+    """Circuit breaker berbasis rasio gagal pada `window` panggilan terakhir."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = self.CLOSED
+        self._results = deque(maxlen=config.BREAKER_WINDOW)  # True = gagal
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> float:
+        """Sisa detik sampai panggilan percobaan boleh dikirim (0 jika circuit tertutup)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + config.BREAKER_OPEN_SECONDS - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.retry_after() > 0:
+                    return False
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                # Hanya satu panggilan percobaan dalam satu waktu
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record(self, failed: bool):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                self._results.clear()
+                if failed:
+                    self._open()
+                else:
+                    self._set_state(self.CLOSED)
+                return
+            self._results.append(failed)
+            failures = sum(self._results)
+            if (
+                self.state == self.CLOSED
+                and len(self._results) >= config.BREAKER_MIN_CALLS
+                and failures / len(self._results) >= config.BREAKER_FAILURE_RATE
+            ):
+                self._open()
+
+    def cancel_probe(self):
+        with self._lock:
+            self._probing = False
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._set_state(self.OPEN)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            self.state = state
+            metrics.count("circuit_transitions", upstream=self.name, state=state)
+
+
+class _Upstream:
+    def __init__(self, name: str, rate: float, burst: float, max_wait: float):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.max_wait = max_wait
+        self.breaker = CircuitBreaker(name)
+        self.inflight = {}   # key -> Future panggilan yang sedang berjalan
+        self.lock = threading.Lock()
+        self.retry_tokens = config.RETRY_BUDGET_MAX
+
+    def check_circuit(self):
+        if not self.breaker.allow():
+            metrics.count("upstream_calls", upstream=self.name, result="circuit_open")
+            raise CircuitOpen(
+                f"Layanan {self.name} sedang bermasalah, dicoba lagi dalam {self.breaker.retry_after():.0f} detik."
+            )
+
+    def deposit_retry_token(self):
+        with self.lock:
+            self.retry_tokens = min(config.RETRY_BUDGET_MAX, self.retry_tokens + config.RETRY_BUDGET_RATIO)
+
+    def take_retry_token(self) -> bool:
+        with self.lock:
+            if self.retry_tokens < 1:
+                return False
+            self.retry_tokens -= 1
+            return True
+
+    def acquire(self):
+        wait = self.bucket.reserve(self.max_wait)
+        if wait is None:
+            metrics.count("rate_limit", upstream=self.name, result="rejected")
+            raise RateLimited(f"Terlalu banyak request ke {self.name}, coba lagi sebentar lagi.")
+        metrics.count("rate_limit", upstream=self.name, result="queued" if wait else "immediate")
+        if wait:
+            with metrics.span("rate_limit_wait", upstream=self.name):
+                time.sleep(wait)
+
+
+_upstreams = {}
+_upstreams_lock = threading.Lock()
+
+
+def _settings(name: str):
+    if name == "justwatch":
+        return config.JUSTWATCH_RATE_PER_SEC, config.JUSTWATCH_RATE_BURST, config.JUSTWATCH_RATE_MAX_WAIT
+    if name == "gemini":
+        return config.GEMINI_RATE_PER_SEC, config.GEMINI_RATE_BURST, config.GEMINI_RATE_MAX_WAIT
+    return 0, 1, 0
+
+
+def _get_upstream(name: str) -> _Upstream:
+    with _upstreams_lock:
+        upstream = _upstreams.get(name)
+        if upstream is None:
+            upstream = _upstreams[name] = _Upstream(name, *_settings(name))
+        return upstream
+
+
+def available(name: str) -> bool:
+    """False jika circuit upstream `name` sedang terbuka (halaman bisa langsung menampilkan versi terbatas)."""
+    return _get_upstream(name).breaker.retry_after() == 0
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter: acak antara 0 dan batas eksponensial
+    return random.uniform(0, min(config.RETRY_BACKOFF_MAX, config.RETRY_BACKOFF_BASE * 2 ** attempt))
+
+
+# Nama kelas exception timeout: requests (Timeout, ConnectTimeout/ReadTimeout
+# turunannya), socket/builtin (TimeoutError) dan google-api-core (DeadlineExceeded).
+# Dicocokkan lewat nama agar modul ini tidak bergantung pada library klien.
+_TIMEOUT_ERRORS = ("Timeout", "TimeoutError", "DeadlineExceeded")
+
+
+def _is_timeout(error: BaseException) -> bool:
+    return any(cls.__name__ in _TIMEOUT_ERRORS for cls in type(error).__mro__)
+
+
+# Koneksi gagal/terputus: requests (ConnectionError, ChunkedEncodingError) dan builtin
+# (ConnectionError beserta turunannya, mis. ConnectionResetError)
+_CONNECTION_ERRORS = ("ConnectionError", "ChunkedEncodingError")
+
+
+def _status_code(error: BaseException):
+    """Status HTTP dari HTTPError requests (`response.status_code`) atau google-api-core (`code`)."""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        status = getattr(error, "code", None)
+    return status if isinstance(status, int) else None
+
+
+def _is_transient(error: BaseException) -> bool:
+    """
+    Gangguan sementara di sisi upstream: timeout, koneksi gagal, 5xx dan 429.
+    Error lain (4xx seperti API key salah, permintaan tidak valid, respons yang
+    tidak bisa dibaca) tidak akan berubah jika diulang dan bukan tanda upstream sakit.
+    """
+    if _is_timeout(error) or any(cls.__name__ in _CONNECTION_ERRORS for cls in type(error).__mro__):
+        return True
+    status = _status_code(error)
+    return status is not None and (status >= 500 or status == 429)
+
+
+def _send(upstream: _Upstream, fn, args, kwargs):
+    """Satu panggilan dengan circuit breaker, rate limit dan retry terbatas."""
+    upstream.deposit_retry_token()
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        upstream.check_circuit()
+        try:
+            upstream.acquire()
+        except RateLimited:
+            # Bukan kegagalan upstream; slot percobaan half-open (jika dipegang) dilepas
+            upstream.breaker.cancel_probe()
+            raise
+        metrics.count("upstream_calls", upstream=upstream.name, result="sent" if attempt == 0 else "retry")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            transient = _is_transient(e)
+            # Error permanen berarti upstream menjawab: tidak dihitung sebagai kegagalan circuit
+            upstream.breaker.record(transient)
+            if (
+                not transient
+                or attempt >= config.UPSTREAM_MAX_RETRIES
+                or _is_timeout(e)
+                or time.monotonic() - started >= config.RETRY_MAX_ELAPSED
+                or upstream.breaker.state != CircuitBreaker.CLOSED
+                or not upstream.take_retry_token()
+            ):
+                metrics.count("upstream_calls", upstream=upstream.name, result="failed")
+                raise
+            time.sleep(_backoff(attempt))
+            attempt += 1
+            continue
+        upstream.breaker.record(False)
+        return result
+
+
+def call(name: str, key, fn, *args, **kwargs):
+    """
+    Menjalankan `fn(*args, **kwargs)` ke upstream `name` dengan single-flight per `key`,
+    circuit breaker, rate limit dan retry. Pemanggil yang menumpang tidak memakai token rate limit.
+    """
+    upstream = _get_upstream(name)
+    with upstream.lock:
+        future = upstream.inflight.get(key)
+        leader = future is None
+        if leader:
+            future = upstream.inflight[key] = Future()
+
+    if not leader:
+        metrics.count("upstream_calls", upstream=name, result="shared")
+        with metrics.span("singleflight_wait", upstream=name):
+            return future.result()
+
+    try:
+        result = _send(upstream, fn, args, kwargs)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        # Termasuk BaseException, supaya pemanggil yang menunggu tidak menggantung
+        future.set_exception(e)
+        raise
+    finally:
+        with upstream.lock:
+            upstream.inflight.pop(key, None)
@@ -0,0 +1,11 @@
+"""Helper kecil yang dipakai bersama oleh beberapa modul."""
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_title(title) -> str:
+    """Menormalkan judul untuk dipakai sebagai key (huruf kecil, spasi dirapikan)."""
+    if not title:
+        return ""
+    return _WHITESPACE.sub(" ", str(title)).strip().casefold()
@@ -0,0 +1,13 @@
+"""
+Modul halaman aplikasi. main.py hanya berisi konfigurasi, session state dan
+routing; modul halaman di-import saat halaman itu pertama kali dibuka,
+sehingga dependensi berat (Plotly di halaman detail, SDK Gemini saat AI
+pertama kali dipanggil) tidak ikut di-load sebelum halaman awal tampil.
+"""
+import streamlit as st
+
+
+def submit_search(query):
+    """Menandai `query` untuk dicari ke API pada run berikutnya (film populer, history, saran)."""
+    st.session_state["last_query"] = query
+    st.session_state["pending_search"] = query
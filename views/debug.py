@@ -0,0 +1,58 @@
+"""Panel debug performa di sidebar (hanya jika FILM_DEBUG_PANEL=1 di server)."""
+import pandas as pd
+import streamlit as st
+
+import config
+import metrics
+
+
+def show_debug_panel():
+    """Panel debug di sidebar: durasi span dan cache hit/miss untuk proses ini."""
+    data = metrics.snapshot()
+    with st.sidebar.expander("🛠 Debug Performa", expanded=True):
+        st.caption("Waktu per operasi sejak proses dimulai (ms). 'Terakhir' = panggilan paling baru.")
+        if data["spans"]:
+            spans = pd.DataFrame([
+                {
+                    "Operasi": item["name"] + "".join(f" [{v}]" for v in item["labels"].values()),
+                    "Jumlah": item["count"],
+                    "Terakhir": item["last_ms"],
+                    "Rata-rata": item["avg_ms"],
+                    "Maks": item["max_ms"],
+                    "Total": item["total_ms"],
+                    "Error": item["errors"],
+                }
+                for item in data["spans"]
+            ]).sort_values("Terakhir", ascending=False)
+            st.dataframe(spans, hide_index=True, use_container_width=True)
+
+        caches = metrics.cache_summary(data)
+        if caches:
+            st.markdown("**Cache**")
+            st.dataframe(
+                pd.DataFrame([
+                    {"Cache": name, "Hit": entry["hit"], "Miss": entry["miss"], "Hit rate": f"{entry['hit_rate']:.0%}"}
+                    for name, entry in sorted(caches.items())
+                ]),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        counters = [counter for counter in data["counters"] if counter["name"] != "cache_requests"]
+        if counters:
+            st.markdown("**Upstream & counter lain**")
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        "Counter": counter["name"],
+                        "Label": ", ".join(f"{k}={v}" for k, v in counter["labels"].items()),
+                        "Nilai": counter["value"],
+                    }
+                    for counter in sorted(counters, key=lambda c: (c["name"], sorted(c["labels"].items())))
+                ]),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        if config.METRICS_FILE:
+            st.caption(f"Metrik ditulis ke `{config.METRICS_FILE}` ({config.METRICS_FORMAT}).")
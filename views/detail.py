@@ -0,0 +1,485 @@
+"""Halaman detail film: info, streaming offers, rekomendasi dan grafik perbandingan."""
+import math
+
+import streamlit as st
+
+import ai_service
+import background
+import charts
+import config
+import metrics
+import offers
+import posters
+import upstream
+
+# Nama upstream -> nama layanan yang ditampilkan ke user
+UPSTREAM_LABELS = {"justwatch": "JustWatch", "gemini": "Gemini AI"}
+
+
+# === PANGGILAN EKSTERNAL HALAMAN DETAIL (PARALEL, TANPA MENUNGGU) ===
+# Nama future -> bagian halaman yang diisi oleh hasilnya
+_FUTURE_SECTIONS = {
+    "offers": ("offers",),
+    "description": ("description",),
+    "recommendations": ("recommendations",),
+    "description_and_recommendations": ("description", "recommendations"),
+    # Batch sinopsis hasil pencarian yang sedang memproses film ini (ai_service.description_batch)
+    "description_batch": ("description",),
+}
+
+def _detail_fetches(movie):
+    """
+    Panggilan eksternal kunjungan halaman detail ini: {"title", "futures", "results"}.
+    Disimpan di session supaya rerun (penuh atau fragment) memakai future yang sama;
+    dibuat ulang saat film berganti (tombol detail di halaman pencarian juga menghapusnya).
+    """
+    title = movie.get("title")
+    fetches = st.session_state.get("detail_fetches")
+    if fetches is None or fetches["title"] != title:
+        fetches = st.session_state.detail_fetches = {"title": title, "futures": {}, "results": {}}
+    return fetches
+
+def _covers(names, section):
+    return any(section in _FUTURE_SECTIONS[name] for name in names)
+
+def start_detail_fetches(movie):
+    """
+    Menjalankan deskripsi AI, streaming offers dan rekomendasi AI secara bersamaan
+    di thread pool tanpa menunggu hasilnya. Yang sudah ada di cache (session, offers)
+    atau sudah diminta di kunjungan ini tidak diminta ulang, dan jika deskripsi +
+    rekomendasi sama-sama dibutuhkan cukup satu panggilan Gemini.
+    Mengembalikan future yang masih berjalan.
+    """
+    current_title = movie.get("title")
+    executor = background.get_executor("detail", config.DETAIL_FETCH_WORKERS)
+    fetches = _detail_fetches(movie)
+    futures = collect_detail_fetches(movie)
+    # Bagian yang sudah diminta (berjalan atau selesai, termasuk yang gagal) di kunjungan ini
+    requested = list(futures) + list(fetches["results"])
+
+    need_description = (
+        not movie.get("overview")
+        and st.session_state.get(f"description_cache_{current_title}") is None
+        and not _covers(requested, "description")
+    )
+    need_recommendations = (
+        ("recommendations_cache" not in st.session_state or st.session_state.get("current_rec_movie") != current_title)
+        and not _covers(requested, "recommendations")
+    )
+
+    if need_recommendations:
+        # Rekomendasi dari katalog lokal (milidetik); Gemini hanya jika katalog belum cukup
+        local_recommendations = st.session_state.catalog.recommend(movie)
+        if local_recommendations:
+            st.session_state.recommendations_cache = local_recommendations
+            st.session_state.current_rec_movie = current_title
+            need_recommendations = False
+
+    # Offers diambil dari data hasil pencarian/cache; request ke API hanya jika belum ada
+    if not _covers(requested, "offers"):
+        local_offers = movie.get("offers")
+        if not isinstance(local_offers, list):
+            local_offers = offers.get_cached_offers(current_title, movie.get("link"))
+        if local_offers is not None:
+            fetches["results"]["offers"] = local_offers
+        else:
+            futures["offers"] = executor.submit(offers.get_movie_offers, movie)
+
+    if need_description:
+        # Sinopsis film ini sedang dibuat batch: tunggu batch-nya lewat polling (tanpa memblokir)
+        batch = ai_service.description_batch(current_title)
+        if batch is not None:
+            futures["description_batch"] = batch
+            need_description = False
+
+    if need_description and need_recommendations:
+        # Satu panggilan Gemini untuk deskripsi + rekomendasi sekaligus
+        futures["description_and_recommendations"] = executor.submit(
+            ai_service.get_movie_description_and_recommendations, current_title
+        )
+    elif need_description:
+        futures["description"] = executor.submit(ai_service.get_movie_description, current_title)
+    elif need_recommendations:
+        futures["recommendations"] = executor.submit(ai_service.get_movie_recommendations, current_title)
+
+    return futures
+
+def collect_detail_fetches(movie):
+    """
+    Memindahkan hasil future yang sudah selesai ke cache session (tanpa menunggu yang
+    belum). Mengembalikan future yang masih berjalan.
+    """
+    current_title = movie.get("title")
+    fetches = _detail_fetches(movie)
+    futures = fetches["futures"]
+
+    for name, future in list(futures.items()):
+        if not future.done():
+            continue
+        del futures[name]
+        if name == "description_batch":
+            # Hasil batch ada di cache deskripsi. Jika batch gagal untuk judul ini tidak
+            # dicatat, supaya run berikutnya meminta deskripsi film ini sendiri
+            result = ai_service.get_cached_description(current_title)
+            if result is None:
+                continue
+            name = "description"
+        else:
+            result = future.result()
+        fetches["results"][name] = result
+        if name == "description_and_recommendations":
+            description, recommendations = result
+        elif name == "description":
+            description = result
+        elif name == "recommendations":
+            recommendations = result
+
+        if name in ("description", "description_and_recommendations"):
+            st.session_state[f"description_cache_{current_title}"] = description
+        if name in ("recommendations", "description_and_recommendations"):
+            st.session_state.recommendations_cache = recommendations
+            # Error (mis. Gemini sedang bermasalah) tidak dianggap milik film mana pun:
+            # kunjungan berikutnya (film ini atau film yang dibuka kembali) mengambil ulang
+            if isinstance(recommendations, dict) and "error" in recommendations:
+                st.session_state.pop("current_rec_movie", None)
+            else:
+                st.session_state.current_rec_movie = current_title
+    return futures
+
+def fill_section(slot, section, movie, render, loading_message, cached=None):
+    """
+    Mengisi placeholder satu bagian: pesan loading selama panggilannya masih berjalan,
+    hasil panggilan kunjungan ini jika sudah selesai, atau `cached` dari cache session.
+    Mengembalikan True jika bagian ini masih menunggu.
+    """
+    fetches = _detail_fetches(movie)
+    if _covers(collect_detail_fetches(movie), section):
+        slot.info(loading_message)
+        return True
+
+    for name, result in fetches["results"].items():
+        if section in _FUTURE_SECTIONS[name]:
+            if name == "description_and_recommendations":
+                result = result[0] if section == "description" else result[1]
+            render(slot, result)
+            return False
+    render(slot, cached)
+    return False
+
+def run_section(section_fn, movie, sections, pending):
+    """
+    Menjalankan satu bagian halaman sebagai fragment. Selama data bagian ini masih
+    ditunggu, fragment dijalankan ulang setiap DETAIL_POLL_INTERVAL detik sampai datanya
+    datang; run penuh halaman sendiri tidak pernah menunggu panggilan eksternal.
+    """
+    polling = any(_covers(pending, section) for section in sections)
+    run_every = config.DETAIL_POLL_INTERVAL if polling else None
+    st.fragment(section_fn, run_every=run_every)(movie, polling)
+
+def stop_polling_when_done(movie, polling):
+    """Satu run penuh setelah semua panggilan selesai, supaya fragment berhenti di-poll."""
+    if polling and not collect_detail_fetches(movie):
+        st.rerun()
+
+def render_description(slot, final_description):
+    with slot.container():
+        if final_description:
+            st.markdown(f"**Ringkasan (dibuat AI):** {final_description}")
+        else:
+            st.markdown("**Ringkasan:** *Tidak ada deskripsi singkat tersedia.*")
+
+def render_streaming_offers(slot, streaming_offers):
+    with slot.container():
+        if streaming_offers is None:
+            st.warning("Data streaming sementara tidak bisa diambil (layanan JustWatch bermasalah). Coba lagi nanti.")
+            return
+        if not streaming_offers:
+            st.info("Tidak ada data streaming yang tersedia dari API IMDB.")
+            return
+
+        unique = {}
+        for item in streaming_offers:
+            url = item.get("url")
+            if url and url not in unique:
+                unique[url] = item
+
+        for item in unique.values():
+            nama = item.get("name", "-")
+            tipe = item.get("type", "-").replace("_", "")
+            link = item.get("url", "#")
+            with st.container():
+                st.markdown(
+                    f"""
+                    <div style="
+                        padding: 15px;
+                        border-radius: 12px;
+                        background: #cccccc;
+                        border: 1px solid #333;
+                        margin-bottom: 10px;
+                    ">
+                        <h3 style="margin: 0; color: white;">{nama}</h3>
+                        <p style="margin: 0; color: #cccccc;">📌 {tipe}</p>
+                        <a href="{link}" target="_blank" style="
+                            display: inline-block;
+                            margin-top: 8px;
+                            padding: 8px 12px;
+                            background: #11111;
+                            border-radius: 8px;
+                            color: black;
+                            font-weight: bold;
+                            text-decoration: none;
+                        ">🔗 Tonton di sini</a>
+                    </div>
+                    """,
+                    unsafe_allow_html=True,
+                )
+
+def render_recommendations(slot, recommendations):
+    with slot.container():
+        if isinstance(recommendations, dict) and "error" in recommendations:
+            st.error(recommendations["error"])
+        elif isinstance(recommendations, list) and recommendations:
+            if recommendations[0].get("sumber") == "lokal":
+                st.caption("Dari katalog film (kemiripan sinopsis, tahun, durasi dan rating).")
+            else:
+                st.caption("Berdasarkan analisis AI (IMDb Data).")
+            # Tampilkan dalam Grid 3 Kolom
+            cols_per_row = 3
+            rows = [recommendations[i:i + cols_per_row] for i in range(0, len(recommendations), cols_per_row)]
+            rec_posters = posters.get_posters([rec.get("image_url") for rec in recommendations])
+
+            for row_idx, row in enumerate(rows):
+                cols = st.columns(cols_per_row)
+                for idx, rec in enumerate(row):
+                    with cols[idx]:
+                        with st.container(border=True):
+                            # Gambar Poster Rekomendasi (thumbnail lokal atau placeholder)
+                            st.image(rec_posters[row_idx * cols_per_row + idx], use_container_width=True)
+                        
+                            st.markdown(f"**{rec.get('judul_film')}**")
+                            if rec.get("sumber") == "lokal":
+                                rating = f"{rec['rating']}%" if rec.get("rating") is not None else "-"
+                                st.caption(f"Tahun: {rec.get('tahun') or '-'} · Rating: {rating}")
+                            else:
+                                st.caption(f"IMDb: {rec.get('imdb_rating')}")
+        else:
+            st.info("Tidak ada rekomendasi yang ditemukan.")
+
+# === LOGIKA UTAMA DETAIL DAN REKOMENDASI DENGAN GRAFIK BATANG ===
+@metrics.timed("show_movie_detail")
+def show_movie_detail():
+    """
+    Halaman ini muncul SETELAH user menekan tombol 'Lihat Detail & Rekomendasi'.
+    Di sini kita menampilkan detail film yang dipilih + Rekomendasi AI + Grafik Perbandingan.
+    """
+    movie = st.session_state.selected_movie
+    if not movie:
+        st.warning("Tidak ada film yang dipilih. Kembali ke pencarian.")
+        st.session_state.page = "search"
+        st.rerun()
+        return
+
+    # Tombol kembali ke hasil pencarian
+    if st.button("← Kembali ke Hasil Pencarian"):
+        st.session_state.page = "search"
+        st.rerun()
+
+    # Upstream yang circuit-nya terbuka langsung gagal; bagiannya tampil terbatas
+    unavailable = [label for name, label in UPSTREAM_LABELS.items() if not upstream.available(name)]
+    if unavailable:
+        st.warning(f"Layanan {' dan '.join(unavailable)} sedang bermasalah, sebagian informasi ditampilkan terbatas.")
+
+    # Mulai semua panggilan eksternal sekarang; run ini tidak menunggu hasilnya,
+    # bagian yang membutuhkannya mengisi dirinya sendiri lewat polling fragment
+    pending = start_detail_fetches(movie)
+
+    st.markdown("---")
+
+    # Setiap bagian adalah fragment: interaksi di dalamnya (mis. memilih film pembanding)
+    # hanya menjalankan ulang bagian itu, bukan seluruh halaman beserta panggilan eksternalnya
+    # --- BAGIAN 1: DETAIL MOVIE YANG DIPILIH ---
+    run_section(show_detail_header, movie, ("description",), pending)
+    run_section(show_streaming_section, movie, ("offers",), pending)
+
+    # --- BAGIAN 2: REKOMENDASI AI ---
+    st.markdown("---")
+    run_section(show_recommendation_section, movie, ("recommendations",), pending)
+
+    st.markdown("---")
+
+    # --- BAGIAN 3: GRAFIK PERBANDINGAN RATING DAN DURASI (BAR CHART) ---
+    show_comparison_section(movie)
+
+
+@metrics.timed("show_detail_header")
+def show_detail_header(movie, polling=False):
+    """Poster, ringkasan, rating dan durasi film."""
+    st.title(movie.get("title", "Detail Film"))
+    
+    col_poster, col_info = st.columns([1, 3])
+    
+    with col_poster:
+        st.image(posters.get_poster(movie.get("poster"), "detail"), use_container_width=True)
+    
+    with col_info:
+        st.subheader(f"{movie.get('title', 'Nama Film')} ({movie.get('year', 'Tahun tidak diketahui')})")
+        
+        # Mendapatkan data awal
+        overview_from_api = movie.get("overview")
+        current_title = movie.get("title")
+
+        # --- LOGIKA PENANGANAN DESKRIPSI (TETAP MENGGUNAKAN GEMINI JIKA API GAGAL) ---
+        if overview_from_api:
+            # Jika API eksternal sukses memberikan deskripsi
+            st.markdown(f"**Ringkasan (dari API):** {overview_from_api[:250]}...")
+        else:
+            fill_section(
+                st.empty(), "description", movie, render_description,
+                f"Ringkasan tidak tersedia. AI sedang membuat deskripsi untuk '{current_title}'...",
+                st.session_state.get(f"description_cache_{current_title}"),
+            )
+        # --- AKHIR LOGIKA DESKRIPSI ---
+            
+        st.markdown("---")
+
+        # Rating & Runtime
+        jwRating = movie.get("jwRating")
+        tomatometer = movie.get("tomatometer")
+        runtime = movie.get("runtime")
+
+        # --- STRUKTUR 3 KOLOM: [JustWatch + Pie] | [Rotten Tomatoes] | [Durasi + Bar Chart] ---
+        cols_metric = st.columns(3) 
+
+        # Gunakan JustWatch Rating (Kolom 1)
+        if jwRating:
+            try:
+                # JustWatch rating (0-1) dikalikan 100
+                jwRating_percent = math.ceil(float(jwRating) * 100) 
+                # Figure dipakai ulang dari cache selama rating-nya sama
+                fig = charts.rating_pie(jwRating_percent)
+
+                with cols_metric[0]:
+                    st.metric("JustWatch", f"{jwRating_percent}%")
+                    st.plotly_chart(fig, use_container_width=True)
+            except ValueError:
+                with cols_metric[0]:
+                    st.info("JustWatch Rating tidak valid.")
+        else:
+              with cols_metric[0]:
+                st.info("JustWatch Rating tidak tersedia.")
+            
+        # Rotten Tomatoes (Kolom 2)
+        if tomatometer:
+            try:
+                tomatometer_val = float(tomatometer)
+                with cols_metric[1]:
+                    st.metric("RottenTomatoes", f"{tomatometer_val}%")
+            except ValueError:
+                pass 
+        
+        # Durasi Film Terpilih & Grafik Perbandingan Durasi (Kolom 3)
+        current_runtime_val = 0
+        with cols_metric[2]:
+            if runtime:
+                try:
+                    current_runtime_val = float(runtime)
+                    # Metrik Durasi Film Ini
+                    st.metric("⏱ Durasi Film Ini", f"{current_runtime_val} min")
+                except ValueError:
+                    pass
+            
+            # Rata-rata durasi semua film yang tersedia (hasil pencarian + import)
+            average_runtime = st.session_state.catalog.average_runtime()
+
+            if current_runtime_val > 0 and average_runtime > 0:
+                # Bar chart durasi film ini vs rata-rata (dari cache figure jika datanya sama)
+                fig_durasi_comp = charts.runtime_vs_average(current_runtime_val, average_runtime)
+                st.plotly_chart(fig_durasi_comp, use_container_width=True)
+            else:
+                st.info("Data durasi atau rata-rata tidak tersedia.")
+
+    stop_polling_when_done(movie, polling)
+
+
+@metrics.timed("show_streaming_section")
+def show_streaming_section(movie, polling=False):
+    """Tempat menonton film ini (offers JustWatch)."""
+    #Menampilkan Link Streaming dari Film Yang Dipilih
+    title = movie.get("title") or movie.get("originalTitle") or ""
+    year = movie.get("year") or ""
+    st.header(f"{title} ({year})")
+
+    st.markdown("---")
+    st.subheader("Tempat Menonton Film Ini")
+    fill_section(st.empty(), "offers", movie, render_streaming_offers, "Memuat data streaming...")
+    stop_polling_when_done(movie, polling)
+
+
+@metrics.timed("show_recommendation_section")
+def show_recommendation_section(movie, polling=False):
+    """Rekomendasi film serupa (katalog lokal atau Gemini)."""
+    st.header(f"Karena kamu melihat '{movie.get('title')}'")
+    st.caption("Berikut adalah rekomendasi film serupa:")
+
+    fill_section(
+        st.empty(), "recommendations", movie, render_recommendations,
+        f"Sedang mencari film yang mirip dengan '{movie.get('title')}'...",
+        st.session_state.get("recommendations_cache"),
+    )
+    stop_polling_when_done(movie, polling)
+
+
+@st.fragment
+@metrics.timed("show_comparison_section")
+def show_comparison_section(movie):
+    """Grafik perbandingan rating & durasi film ini dengan film lain (tanpa panggilan eksternal)."""
+    st.header("Perbandingan Film dari Rating & Durasi")
+    st.caption("Bandingkan film ini dengan film lain dari hasil pencarian/import.")
+    
+    movie_catalog = st.session_state.catalog
+
+    # Label film yang sedang dilihat (judul, atau judul + tahun jika ada judul kembar)
+    current_movie_title = movie_catalog.find_label(movie) or movie.get("title")
+
+    # Filter film yang sedang dilihat dari opsi multiselect
+    options_for_select = [title for title in movie_catalog.labels() if title != current_movie_title]
+
+    # Multiselect untuk memilih 3 film
+    selected_titles = st.multiselect(
+        "Pilih film lain untuk perbandingan (maksimal 3 film tambahan)",
+        options=options_for_select,
+        default=[t for t in st.session_state.selected_comparison_movies if t in options_for_select],
+        max_selections=3,
+        key="comparison_selector"
+    )
+
+    # Update session state
+    st.session_state.selected_comparison_movies = selected_titles
+    
+    # Siapkan DataFrame untuk Plotly (seleksi vektor dari tabel katalog yang sudah bertipe)
+    df, skipped_titles = movie_catalog.comparison_frame(movie, selected_titles)
+
+    if skipped_titles:
+        st.warning(f"Film berikut dilewati dari grafik karena data rating dan durasi tidak tersedia (0): **{', '.join(skipped_titles)}**")
+
+    if df.empty:
+        st.error("Data perbandingan tidak valid atau semua film yang dipilih tidak memiliki data rating/durasi.")
+        return
+    
+    # IMPLEMENTASI BAR CHART DENGAN 2 KOLOM
+    
+    col_durasi, col_rating = st.columns(2)
+    
+    # Grafik Batang untuk Durasi
+    with col_durasi:
+        st.subheader("Perbandingan Durasi Film")
+        fig_durasi = charts.comparison_bar(df, "Durasi (menit)", "Durasi (menit)")
+        st.plotly_chart(fig_durasi, use_container_width=True)
+
+    # Grafik Batang untuk Rating
+    with col_rating:
+        st.subheader("Perbandingan Rating Film")
+        fig_rating = charts.comparison_bar(df, "Rating (%)", "Rating (%) (JustWatch/RottenTomatoes)", range_y=[0, 100])
+        st.plotly_chart(fig_rating, use_container_width=True)
+    
+    st.markdown("---")
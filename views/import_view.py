@@ -0,0 +1,41 @@
+"""Halaman daftar film hasil import."""
+import streamlit as st
+
+import config
+import importer
+import metrics
+import posters
+
+
+@metrics.timed("show_import_view")
+def show_import_view():
+    """Menampilkan data yang diimport"""
+    st.title("📋 Data Film yang Diimport")
+    
+    if st.button("← Kembali"):
+        st.session_state.page = "start"
+        st.rerun()
+    
+    imported_data = st.session_state.get("imported_data", [])
+    
+    if len(imported_data) == 0:
+        st.warning("Tidak ada data yang diimport")
+        return
+    
+    st.success(f"Berhasil mengimport {len(imported_data)} film!")
+
+    # Data import bisa sangat besar, yang dirender hanya sebagian awal
+    if len(imported_data) > config.IMPORT_VIEW_LIMIT:
+        st.caption(f"Menampilkan {config.IMPORT_VIEW_LIMIT} film pertama.")
+    
+    items = list(importer.iter_records(imported_data[:config.IMPORT_VIEW_LIMIT]))
+    # Thumbnail lokal (diunduh paralel sekali, lalu dari cache disk)
+    poster_images = posters.get_posters([item.get("poster") or item.get("poster_url") for item in items])
+    for i, (item, poster_image) in enumerate(zip(items, poster_images)):
+        with st.container(border=True):
+            col1, col2 = st.columns([1, 4])
+            with col1:
+                st.image(poster_image, use_container_width=True)
+            with col2:
+                st.subheader(item.get("title", "Tanpa Judul"))
+                st.write(item.get("overview", ""))
@@ -0,0 +1,181 @@
+"""Halaman pencarian: input dengan saran judul, hasil per halaman dan export."""
+import functools
+import math
+
+import streamlit as st
+
+import ai_service
+import config
+import exporter
+import metrics
+import movie_search
+import offers
+import posters
+import suggest
+from views import submit_search
+
+
+@metrics.timed("show_search_suggestions")
+def show_search_suggestions(search_query):
+    """Judul lain yang mirip dari index lokal; API baru dipanggil jika salah satu saran dipilih."""
+    query_key = search_query.strip().casefold()
+    suggestions = [
+        title for title in suggest.suggest(search_query, st.session_state.title_index)
+        if title.strip().casefold() != query_key
+    ]
+    if not suggestions:
+        return
+    st.caption("Judul serupa (klik untuk mencari):")
+    cols_per_row = 3
+    for i in range(0, len(suggestions), cols_per_row):
+        cols = st.columns(cols_per_row)
+        for idx, title in enumerate(suggestions[i:i + cols_per_row]):
+            cols[idx].button(title, key=f"suggest_btn_{i + idx}", use_container_width=True,
+                             on_click=submit_search, args=(title,))
+
+@metrics.timed("show_search_page")
+def show_search_page():
+    
+    # Tombol kembali
+    if st.button("← Kembali ke Beranda"):
+        st.session_state.page = "start"
+        st.rerun()
+    
+    st.title("Pencarian Film")
+    st.markdown("---")
+
+    # HISTORY PENCARIAN
+    if st.session_state.search_history:
+        with st.expander("History Pencarian Terakhir"):
+            hist_cols = st.columns(3)
+            for idx, hist in enumerate(reversed(st.session_state.search_history[-3:])):
+                if idx < 3:
+                    with hist_cols[idx]:
+                        st.button(f"{hist}", use_container_width=True, key=f"hist_btn_{idx}",
+                                  on_click=submit_search, args=(hist,))
+
+    # Query dari film populer / history / saran langsung dicari
+    pending_query = st.session_state.pop("pending_search", None)
+    if pending_query is not None:
+        st.session_state.search_input = pending_query
+    elif "search_input" not in st.session_state:
+        st.session_state.search_input = st.session_state.get("last_query", "")
+
+    # Form: Enter di kolom input sama dengan menekan tombol Cari, dan mengetik tidak memicu rerun
+    with st.form("search_form", border=False):
+        col1, col2 = st.columns([3,1])
+        with col1:
+            search_query = st.text_input("Nama film", key="search_input", placeholder="Misal: Avatar, Avengers")
+        with col2:
+            st.write("") # Spacer layout
+            st.write("")
+            search_button = st.form_submit_button("Cari Film", type="primary", use_container_width=True)
+
+    # Logika Pencarian: API hanya dipanggil saat form dikirim atau ada query terpilih
+    # (film populer, history, saran judul; semuanya lewat submit_search)
+    query_to_run = pending_query if pending_query else (search_query if search_button and search_query else None)
+    if query_to_run:
+        search_query = query_to_run
+        st.session_state["last_executed_query"] = search_query # Tandai query ini sudah dijalankan
+        st.session_state["last_query"] = search_query
+        
+        # Simpan History
+        if search_query not in st.session_state.search_history:
+            st.session_state.search_history.append(search_query)
+            st.session_state.title_index.add([search_query])
+
+        with st.spinner("Mencari film..."):
+            results = movie_search.fetch_movies(search_query)
+        # Judul hasil pencarian masuk ke index saran bersama
+        suggest.add_results(results)
+        # Offers disimpan supaya halaman detail tidak perlu request ulang
+        offers.remember_offers(results)
+        # Sinopsis AI untuk film tanpa overview dibuat di background
+        ai_service.start_description_batch(results)
+        
+        st.session_state.search_results = results # Simpan hasil
+        st.session_state.search_results_hash = exporter.content_hash(results) if isinstance(results, list) else None
+        st.session_state.search_page = 0 # Hasil baru selalu mulai dari halaman pertama
+        st.session_state.catalog.set_source("search", results)
+
+    # Saran judul dari index lokal untuk query terakhir (mis. salah ketik)
+    if search_query:
+        show_search_suggestions(search_query)
+
+    # Tampilkan Hasil
+    results = st.session_state.search_results
+    
+    if isinstance(results, dict) and "_error" in results:
+        st.error(f"Error: {results['_error']}")
+    elif isinstance(results, list) and results:
+        st.success(f"Ditemukan {len(results)} film.")
+        
+        # === FITUR EXPORT (JSON/CSV/PARQUET/ARROW) ===
+        with st.expander("📤 Export Hasil Pencarian"):
+            export_cols = st.columns(len(exporter.FORMATS))
+            for col, (fmt, (label, ext, mime)) in zip(export_cols, exporter.FORMATS.items()):
+                # File baru dibuat saat tombol diklik (callable), bukan di setiap rerun
+                col.download_button(
+                    f"Download {label}",
+                    data=functools.partial(exporter.get_artifact, fmt, results, st.session_state.search_results_hash),
+                    file_name=f"hasil_{st.session_state.get('last_query', 'pencarian')}.{ext}",
+                    mime=mime,
+                    on_click="ignore",
+                )
+
+        # === TAMPILAN GRID FILM (per halaman) ===
+        page_count = math.ceil(len(results) / config.SEARCH_PAGE_SIZE)
+        page = min(st.session_state.get("search_page", 0), page_count - 1)
+        start = page * config.SEARCH_PAGE_SIZE
+        # Hanya potongan halaman aktif yang dibuat elemennya (dan diminta posternya)
+        show_search_grid(results[start:start + config.SEARCH_PAGE_SIZE], start)
+
+        if page_count > 1:
+            show_search_pagination(page, page_count)
+
+@metrics.timed("show_search_grid")
+def show_search_grid(page_results, offset):
+    cards_per_row = config.SEARCH_CARDS_PER_ROW
+    # Hanya poster kartu di halaman ini yang diambil (paralel, dari cache disk jika ada)
+    poster_images = posters.get_posters([item.get("poster") for item in page_results])
+    for i in range(0, len(page_results), cards_per_row):
+        row = page_results[i:i+cards_per_row]
+        cols = st.columns(cards_per_row)
+
+        for idx, item in enumerate(row):
+            with cols[idx]:
+                with st.container(border=True):
+                    # Poster
+                    st.image(poster_images[i + idx], use_container_width=True)
+                    
+                    st.subheader(f"{item.get('title')}")
+                    st.caption(f"Tahun: {item.get('year')}")
+                    
+                    # LOGIKA TOMBOL DETAIL (posisi absolut agar key unik di semua halaman)
+                    btn_key = f"detail_{offset + i}{idx}{item.get('title')}"
+                    if st.button("Lihat Detail & Rekomendasi", key=btn_key, use_container_width=True, type="primary"):
+                        st.session_state.selected_movie = item
+                        # Kunjungan baru: panggilan eksternal (termasuk yang gagal) dicoba lagi
+                        st.session_state.pop("detail_fetches", None)
+                        # Reset pilihan perbandingan saat memilih film baru
+                        st.session_state.selected_comparison_movies = [] 
+                        st.session_state.page = "detail"
+                        st.rerun()
+
+def _go_to_search_page(page):
+    st.session_state.search_page = page
+
+@metrics.timed("show_search_pagination")
+def show_search_pagination(page, page_count):
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        st.button("← Sebelumnya", key="search_prev", use_container_width=True,
+                  disabled=page == 0, on_click=_go_to_search_page, args=(page - 1,))
+    with info_col:
+        st.markdown(
+            f"<div style='text-align: center; padding-top: 0.5em;'>Halaman {page + 1} dari {page_count}</div>",
+            unsafe_allow_html=True,
+        )
+    with next_col:
+        st.button("Berikutnya →", key="search_next", use_container_width=True,
+                  disabled=page >= page_count - 1, on_click=_go_to_search_page, args=(page + 1,))
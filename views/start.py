@@ -0,0 +1,113 @@
+"""Halaman awal: film populer dan import/export data."""
+import streamlit as st
+
+import background
+import config
+import importer
+import metrics
+from views import submit_search
+
+
+@metrics.timed("show_start_page")
+def show_start_page():
+    st.title("Pencarian Film")
+    st.markdown("Cari info film lengkap dengan sekali klik!")
+    
+    # Tampilkan film populer
+    show_popular_movies()
+    
+    # Fitur Import/Export di halaman awal
+    show_import_export()
+    
+    st.markdown("---")
+    
+    st.subheader("Cara Menggunakan:")
+    st.markdown("""
+    1. *Klik tombol 'Mulai Cari Film'* di bawah
+    2. *Masukkan nama film* yang ingin dicari
+    3. *Pilih Film:* Klik tombol "Lihat Detail" pada film yang diinginkan.
+    4. *Dapatkan Rekomendasi:* AI akan otomatis mencarikan film serupa di halaman detail.
+    """)
+    
+    st.markdown("---")
+    
+    if st.button("🚀 Mulai Cari Film", type="primary"):
+        st.session_state.page = "search"
+        st.rerun()
+
+@metrics.timed("show_popular_movies")
+def show_popular_movies():
+    """Menampilkan film-film populer sebagai quick access"""
+    st.subheader("🎭 Film Populer")
+    
+    popular_queries = config.POPULAR_QUERIES
+    
+    cols = st.columns(len(popular_queries))
+    for idx, movie in enumerate(popular_queries):
+        with cols[idx]:
+            if st.button(f"🎬 {movie}", use_container_width=True):
+                st.session_state.page = "search"
+                submit_search(movie)
+                st.rerun()
+
+@metrics.timed("show_import_export")
+def show_import_export():
+    """Menampilkan fitur Import/Export"""
+    st.subheader("📁 Import & Export Data")
+    
+    col_import, col_export = st.columns(2)
+    
+    with col_import:
+        st.markdown("### 📥 Import Data")
+        uploaded_file = st.file_uploader(
+            "Unggah file JSON/CSV/Parquet/Arrow", 
+            type=importer.accepted_extensions(),
+            help="Unggah file hasil export sebelumnya"
+        )
+        
+        if uploaded_file is not None:
+            try:
+                fmt = importer.detect_format(uploaded_file)
+                if fmt is None:
+                    raise ValueError("Format file tidak dikenali (gunakan JSON, CSV, Parquet atau Arrow).")
+
+                # File yang sama tidak di-parse ulang di setiap rerun
+                if st.session_state.get("imported_file_id") != uploaded_file.file_id:
+                    progress_bar = st.progress(0.0, text="Membaca file...")
+
+                    def update_progress(fraction, row_count):
+                        progress_bar.progress(fraction, text=f"Memproses {row_count} film...")
+
+                    imported_data = importer.import_file(uploaded_file, fmt, progress_callback=update_progress)
+                    progress_bar.empty()
+
+                    st.session_state.imported_data = imported_data
+                    st.session_state.imported_format = fmt.upper()
+                    st.session_state.imported_file_id = uploaded_file.file_id
+                    st.session_state.catalog.set_source("import", imported_data)
+                    # Index saran untuk data besar diisi di background
+                    background.get_executor("suggest", 1).submit(
+                        st.session_state.title_index.add, imported_data["title"].dropna().tolist()
+                    )
+                    background.get_executor("recommender", 1).submit(st.session_state.catalog.sync_recommender)
+
+                imported_count = len(st.session_state.imported_data)
+                st.success(f"✅ Berhasil import {imported_count} film dari {st.session_state.imported_format}!")
+
+                if st.button("📋 Lihat Data Import"):
+                    st.session_state.page = "import_view"
+                    st.rerun()
+                        
+            except Exception as e:
+                st.error(f"❌ Error importing file: {str(e)}")
+    
+    with col_export:
+        st.markdown("### 📤 Export Data")
+        st.info("Fitur export tersedia di halaman pencarian setelah hasil muncul.")
+        
+        st.download_button(
+            label="📄 Download Template CSV",
+            data="title,year,runtime,jwRating,tomatometer,overview,poster\nAvengers,2012,143,0.95,92,Sekelompok pahlawan super berkumpul,null,null\n",
+            file_name="template_film.csv",
+            mime="text/csv"
+        )
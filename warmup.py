@@ -0,0 +1,52 @@
+"""
+Warm-up cache saat proses aplikasi start.
+
+Query "Film Populer" adalah yang paling sering diklik pertama kali setelah
+deploy. Hasil pencarian, streaming offers, thumbnail poster dan rekomendasi
+AI-nya diambil di background (dengan jumlah thread terbatas) supaya klik
+pertama sudah dilayani dari cache.
+"""
+import logging
+import threading
+
+import ai_service
+import background
+import config
+import movie_search
+import offers
+import posters
+import suggest
+
+logger = logging.getLogger(__name__)
+
+_started = False
+_started_lock = threading.Lock()
+
+
+def _warm_query(query: str):
+    results = movie_search.fetch_movies(query)
+    if not isinstance(results, list):
+        logger.warning("Warm-up '%s' gagal: %s", query, results.get("_error") if isinstance(results, dict) else results)
+        return
+
+    offers.remember_offers(results)
+    suggest.add_results(results)
+    ai_service.start_description_batch(results)
+    # Thumbnail halaman pertama grid
+    posters.prefetch([movie.get("poster") for movie in results[:config.SEARCH_PAGE_SIZE]])
+    for movie in results[:config.WARMUP_RECOMMENDATIONS_PER_QUERY]:
+        if movie.get("title"):
+            ai_service.get_movie_recommendations(movie["title"])
+
+
+def start_warmup():
+    """Menjalankan warm-up sekali per proses (panggilan berikutnya diabaikan)."""
+    global _started
+    with _started_lock:
+        if _started or not config.WARMUP_ENABLED:
+            return
+        _started = True
+
+    executor = background.get_executor("warmup", config.WARMUP_WORKERS)
+    for query in config.POPULAR_QUERIES:
+        executor.submit(_warm_query, query)